@@ -0,0 +1,67 @@
+"""
+Порівняння обсягу передачі на один перегляд презентації.
+
+"Вбудовані" - стилі та скрипти вставлені в кожну сторінку (як було раніше).
+"Зовнішні" - сторінка посилається на файли з відбитком вмісту: при першому
+перегляді завантажуються сторінка і файли, при повторних (файли вже в кеші
+браузера) - тільки сторінка. Розміри наведено без стиснення та з gzip.
+
+Запуск:
+    python -m benchmarks.bench_assets
+"""
+import gzip
+import re
+import sys
+
+from tebook.assets import ASSETS, ASSETS_URL
+from tebook.parser import parse_draft
+from tebook.renderer import render_html
+from benchmarks.synthetic import generate_draft
+
+SIZES = [10, 50, 200]
+VIEW_MODES = ["slides", "document", "full-document"]
+
+_LINK_RE = re.compile(rf"<link rel='stylesheet' href='{ASSETS_URL}/([^']+)'>")
+_SCRIPT_RE = re.compile(rf"<script src='{ASSETS_URL}/([^']+)'></script>")
+
+
+def _content(fingerprinted: str) -> str:
+    for asset in ASSETS.values():
+        if asset.fingerprinted == fingerprinted:
+            return asset.path.read_text(encoding="utf-8")
+    raise KeyError(fingerprinted)
+
+
+def inline_assets(page: str) -> str:
+    """Сторінка з усіма стилями та скриптами, вставленими всередину"""
+    page = _LINK_RE.sub(lambda m: f"<style>\n{_content(m.group(1))}</style>", page)
+    return _SCRIPT_RE.sub(lambda m: f"<script>\n{_content(m.group(1))}</script>", page)
+
+
+def referenced_assets(page: str) -> list:
+    return [_content(name) for name in _LINK_RE.findall(page) + _SCRIPT_RE.findall(page)]
+
+
+def _sizes(*texts: str) -> tuple:
+    raw = sum(len(text.encode("utf-8")) for text in texts)
+    packed = sum(len(gzip.compress(text.encode("utf-8"), compresslevel=9)) for text in texts)
+    return raw, packed
+
+
+def main() -> int:
+    print(f"{'слайдів':>8} {'режим':>14} | {'вбудовані':>17} | {'зовнішні, 1-й':>17} | {'зовнішні, далі':>17}")
+    print(f"{'':>8} {'':>14} | {'байт':>8} {'gzip':>8} | {'байт':>8} {'gzip':>8} | {'байт':>8} {'gzip':>8}")
+    for size in SIZES:
+        slides = parse_draft(generate_draft(size))
+        for view_mode in VIEW_MODES:
+            page = render_html(slides, "python", "html-tut", view_mode)
+            inline = _sizes(inline_assets(page))
+            first = _sizes(page, *referenced_assets(page))
+            repeat = _sizes(page)
+            print(f"{size:>8} {view_mode:>14} | {inline[0]:>8} {inline[1]:>8} | "
+                  f"{first[0]:>8} {first[1]:>8} | {repeat[0]:>8} {repeat[1]:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Накладні витрати автентифікації на один запит.
+
+1. Залежність get_current_user_optional з кукі access_token: повна
+   перевірка jwt.decode (як було раніше, кеш очищується перед кожним
+   викликом) проти кешу перевірених токенів, а також шлях з видачею
+   нового токена (до закінчення лишилося менше TOKEN_RENEW_BEFORE_MINUTES).
+2. Повний запит /instructions/ з middleware оновлення кукі і без нього.
+
+Запуск:
+    python -m benchmarks.bench_auth [--calls 20000] [--requests 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from tebook import dal
+from tebook.cache import token_cache
+from tebook.main import app
+from tebook.routers import login_router
+
+
+def _request(token: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"",
+                    "headers": [(b"cookie", f"access_token={token}".encode())]})
+
+
+def _token(minutes: int) -> str:
+    claims = {"sub": "teacher", "role": "teacher",
+              "exp": datetime.now(timezone.utc) + timedelta(minutes=minutes)}
+    return jwt.encode(claims, login_router.SECRET_KEY, algorithm=login_router.ALGORITHM)
+
+
+def _per_call(func, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - started) / calls
+
+
+def _requests_per_call(client: TestClient, requests: int) -> float:
+    client.get("/instructions/")
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get("/instructions/")
+    return (time.perf_counter() - started) / requests
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Накладні витрати автентифікації на запит")
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    fresh = _token(login_router.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expiring = _token(login_router.TOKEN_RENEW_BEFORE_MINUTES - 1)
+
+    def decode_every_time():
+        token_cache.clear()
+        login_router.get_current_user_optional(_request(fresh))
+
+    print(f"{'залежність':>34} {'мкс/виклик':>11}")
+    for title, func in (
+        ("jwt.decode на кожен запит (було)", decode_every_time),
+        ("кеш перевірених токенів", lambda: login_router.get_current_user_optional(_request(fresh))),
+        ("кеш + видача нового токена", lambda: login_router.get_current_user_optional(_request(expiring))),
+        ("без кукі", lambda: login_router.get_current_user_optional(_request(""))),
+    ):
+        print(f"{title:>34} {_per_call(func, args.calls) * 1e6:>11.1f}")
+
+    print(f"\n{'запит /instructions/':>34} {'мкс/запит':>11}")
+    # Запуск застосунку ініціалізує БД, тому вона тимчасова, а не ./tebook.db
+    with tempfile.TemporaryDirectory() as workdir:
+        dal.engine = dal.create_db_engine(os.path.join(workdir, "bench.db"))
+        with TestClient(app) as client:
+            client.cookies.set("access_token", fresh)
+            with_middleware = _requests_per_call(client, args.requests)
+            middleware = app.user_middleware
+            app.user_middleware = [m for m in middleware if m.cls is not login_router.TokenRenewalMiddleware]
+            app.middleware_stack = None
+            without_middleware = _requests_per_call(client, args.requests)
+            app.user_middleware = middleware
+            app.middleware_stack = None
+        dal.engine.dispose()
+    print(f"{'без middleware оновлення кукі':>34} {without_middleware * 1e6:>11.0f}")
+    print(f"{'з middleware оновлення кукі':>34} {with_middleware * 1e6:>11.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Пропускна здатність БД під паралельним навантаженням для профілів
+підключення (налаштування db_profile).
+
+Кілька процесів (як кілька воркерів uvicorn) читають чернетки (get_draft),
+кілька одночасно змінюють їхній вміст (update_draft). Для кожного профілю
+використовується окремий тимчасовий файл БД.
+
+Запуск:
+    python -m benchmarks.bench_db [--seconds 3] [--readers 4] [--writers 2]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy.exc import OperationalError
+
+from tebook import dal
+from tebook.settings import Settings
+from benchmarks.synthetic import generate_draft
+
+DRAFTS = 200
+
+
+def _worker(path: str, profile: str, kind: str, seconds: float, seed: int) -> dict:
+    """Виконує читання або запис до кінця інтервалу (в окремому процесі)"""
+    dal.engine = dal.create_db_engine(path, Settings(db_profile=profile))
+    rng = random.Random(seed)
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if kind == "reads":
+                dal.get_draft(rng.randint(1, DRAFTS))
+            else:
+                # Невеликий унікальний вміст: час іде на транзакцію, а не на парсинг
+                dal.update_draft(rng.randint(1, DRAFTS), content=f"@1 Оновлення {rng.random()}\n@3 Текст")
+            counts[kind] += 1
+        except OperationalError:
+            counts["errors"] += 1
+    dal.engine.dispose()
+    return counts
+
+
+def _measure(profile: str, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "bench.db")
+        dal.engine = dal.create_db_engine(path, Settings(db_profile=profile))
+        dal.init_db()
+        for i in range(DRAFTS):
+            dal.create_draft(f"Чернетка {i}", generate_draft(20, seed=i))
+        dal.engine.dispose()
+
+        kinds = ["reads"] * readers + ["writes"] * writers
+        totals = {"reads": 0, "writes": 0, "errors": 0}
+        with ProcessPoolExecutor(max_workers=len(kinds)) as executor:
+            futures = [executor.submit(_worker, path, profile, kind, seconds, i) for i, kind in enumerate(kinds)]
+            for future in futures:
+                for key, value in future.result().items():
+                    totals[key] += value
+    return {key: value / seconds for key, value in totals.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Пропускна здатність БД для профілів підключення")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'профіль':>11} {'читань/с':>9} {'записів/с':>10} {'помилок/с':>10}")
+    for profile in ("basic", "production"):
+        stats = _measure(profile, args.seconds, args.readers, args.writers)
+        print(f"{profile:>11} {stats['reads']:>9.0f} {stats['writes']:>10.0f} {stats['errors']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Список чернеток на великій БД (за замовчуванням 50 000 чернеток).
+
+Порівнює завантаження всіх чернеток разом із вмістом (як список працював
+раніше) зі сторінками проєкції без вмісту
+(list_drafts_page): першою і глибокою, в середині списку.
+
+Запуск:
+    python -m benchmarks.bench_drafts_list [--drafts 50000]
+"""
+import argparse
+import datetime as dt
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session, joinedload
+
+from tebook import dal
+from tebook.models import Draft, DraftContent
+from benchmarks.synthetic import generate_draft
+
+
+def _seed(count: int):
+    """Масово вставляє чернетки з різним вмістом (по ~20 слайдів)"""
+    start = dt.datetime(2024, 1, 1)
+    with dal.engine.begin() as conn:
+        contents, drafts = [], []
+        for i in range(count):
+            content = generate_draft(20, seed=i % 1000) + f"\n@1 Чернетка {i}"
+            digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+            stamp = (start + dt.timedelta(minutes=i)).isoformat()
+            contents.append({"hash": digest, "content": content, "slides_data": None})
+            drafts.append({"title": f"Чернетка {i}", "language": "python", "doc_type": "html-stu",
+                           "view_modes": None, "created_at": stamp, "updated_at": stamp, "content_hash": digest})
+        conn.execute(insert(DraftContent), contents)
+        conn.execute(insert(Draft), drafts)
+
+
+def _all_drafts_with_content():
+    """Усі чернетки разом із вмістом, як список завантажувався раніше"""
+    with Session(dal.engine) as db:
+        return db.scalars(select(Draft).options(joinedload(Draft.body))).all()
+
+
+def _time(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Список чернеток на великій БД")
+    parser.add_argument("--drafts", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        dal.engine = dal.create_db_engine(os.path.join(workdir, "bench.db"))
+        dal.init_db()
+        _seed(args.drafts)
+
+        # Ключ сторінки посередині списку
+        middle = None
+        for _ in range(args.drafts // 2 // dal.DRAFTS_PAGE_SIZE):
+            _, middle = dal.list_drafts_page("updated", middle)
+
+        print(f"{'запит':>36} {'мс':>9}")
+        for title, func in (
+            ("усі чернетки з вмістом (було)", _all_drafts_with_content),
+            ("перша сторінка", lambda: dal.list_drafts_page("updated")),
+            (f"сторінка {args.drafts // 2 // dal.DRAFTS_PAGE_SIZE + 1}", lambda: dal.list_drafts_page("updated", middle)),
+            ("перша сторінка (за створенням)", lambda: dal.list_drafts_page("created")),
+        ):
+            print(f"{title:>36} {_time(func, repeat=1 if 'було' in title else 5) * 1e3:>9.1f}")
+        dal.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
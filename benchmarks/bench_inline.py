@@ -0,0 +1,98 @@
+"""
+Мікробенчмарк обробки вбудованої розмітки у текстових слайдах (@3).
+
+Порівнює однопрохідний process_text з попереднім ланцюжком re.sub
+({{код}}, {виділений}, [[посилання]], переноси рядків) та окремим
+проходом process_latin_italic по вже згенерованому HTML.
+
+Перед вимірюванням перевіряється, що без виділення латинських слів
+process_text дає той самий HTML, що й попередня реалізація (EQUIVALENCE_CASES:
+зокрема код у виділеному тексті і фігурні дужки в коді). Якщо результати
+розходяться, бенчмарк завершується з кодом 1.
+
+Запуск:
+    python -m benchmarks.bench_inline
+"""
+import re
+import sys
+import timeit
+
+from tebook.parser import parse_draft
+from tebook.renderer import process_text
+from benchmarks.synthetic import generate_draft
+
+SIZES = [100, 1_000, 10_000]
+
+# Розмітка, для якої однопрохідна обробка має дати той самий HTML, що й попередня
+EQUIVALENCE_CASES = [
+    "звичайний текст",
+    "{виділений} і {{код}}",
+    "рядок 1\nрядок 2",
+    "[[https://example.com]] і [[схема.png]]",
+    # Код у виділеному тексті
+    "{Use {{print}} here}",
+    "{a {{b}} c {{d}}}",
+    "{{{a}}}",
+    # Фігурні дужки в коді
+    "{{d = {1: 2}}}",
+    "{{d = {1: 2}}} і {x}",
+    "{{a {b}} {{c}} d}",
+    "{{f({a}}",
+    # Незакриті дужки
+    "{a {b}",
+    "{a {{b}}",
+    "{{a}",
+]
+
+
+def legacy_process_text(text: str) -> str:
+    """Попередня реалізація: три проходи re.sub і заміна переносів рядків"""
+    text = re.sub(r'\{\{([^}]+)\}\}', r'<code>\1</code>', text)
+    text = re.sub(r'\{([^}]+)\}', r'<strong>\1</strong>', text)
+
+    def process_link(match):
+        link = match.group(1)
+        if link.startswith('http://') or link.startswith('https://'):
+            return f'<a href="{link}" target="_blank">{link}</a>'
+        return f'<img src="{link}" alt="{link}">'
+
+    text = re.sub(r'\[\[([^\]]+)\]\]', process_link, text)
+    return text.replace('\n', '<br>')
+
+
+def legacy_process_latin_italic(text: str) -> str:
+    """Попередня реалізація: четвертий прохід по згенерованому HTML"""
+    return re.sub(r'\b[a-zA-Z]{2,}\b', lambda m: f'<span class="italic">{m.group(0)}</span>', text)
+
+
+def check_equivalence() -> list:
+    """Випадки, для яких process_text і попередня реалізація дають різний HTML"""
+    return [(text, process_text(text), legacy_process_text(text))
+            for text in EQUIVALENCE_CASES
+            if process_text(text) != legacy_process_text(text)]
+
+
+def _best_of(func) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main() -> int:
+    mismatches = check_equivalence()
+    for text, current, legacy in mismatches:
+        print(f"Розбіжність для {text!r}:\n  стало: {current}\n  було:  {legacy}")
+    if mismatches:
+        return 1
+
+    print(f"{'слайдів @3':>11} {'було, мс':>10} {'стало, мс':>10} {'прискорення':>12}")
+    for size in SIZES:
+        texts = [slide.content for slide in parse_draft(generate_draft(size)) if slide.slide_type == "@3" and slide.content]
+        legacy = _best_of(lambda: [legacy_process_latin_italic(legacy_process_text(t)) for t in texts])
+        current = _best_of(lambda: [process_text(t, latin_italic=True) for t in texts])
+        print(f"{len(texts):>11} {legacy * 1000:>10.3f} {current * 1000:>10.3f} {legacy / current:>11.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
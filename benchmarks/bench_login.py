@@ -0,0 +1,101 @@
+"""
+Хвиля входів на початку заняття і затримка інших запитів.
+
+Кілька десятків студентів входять одночасно, поки інші запити (сторінка
+/instructions/, без БД і паролів) продовжують надходити. Порівнюються:
+
+"на циклі подій" - bcrypt виконується прямо в обробнику входу (як було
+раніше), і кожна перевірка блокує всі інші запити;
+"пул потоків" - перевірка в обмеженому пулі потоків (run_password_check).
+
+Запуск:
+    python -m benchmarks.bench_login [--users 30] [--light 200]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy.orm import Session
+
+from tebook import dal
+from tebook.main import app
+from tebook.models import User
+from tebook.passwords import check_password, hash_password
+from tebook.routers import login_router
+
+
+async def _blocking_password_check(password, hashed):
+    return check_password(password, hashed)
+
+
+async def _burst(users: int, light: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    login_latencies = []
+    light_latencies = []
+
+    async def login(client: httpx.AsyncClient, i: int):
+        started = time.perf_counter()
+        response = await client.post("/login", data={"username": f"student{i}", "password": "123456"})
+        login_latencies.append(time.perf_counter() - started)
+        assert response.status_code == 302, response.status_code
+
+    async def browse(client: httpx.AsyncClient):
+        for _ in range(light):
+            started = time.perf_counter()
+            response = await client.get("/instructions/")
+            light_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200
+            await asyncio.sleep(0.005)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        await asyncio.gather(browse(client), *(login(client, i) for i in range(users)))
+        elapsed = time.perf_counter() - started
+
+    light_latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "login_p50": statistics.median(login_latencies),
+        "light_p50": statistics.median(light_latencies),
+        "light_p95": light_latencies[int(len(light_latencies) * 0.95) - 1],
+        "light_max": light_latencies[-1],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Хвиля входів і затримка інших запитів")
+    parser.add_argument("--users", type=int, default=30)
+    parser.add_argument("--light", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        dal.engine = dal.create_db_engine(os.path.join(workdir, "bench.db"))
+        dal.init_db()
+        # Один хеш на всіх: пароль однаковий, а хешувати кожен окремо довго
+        hashed = hash_password("123456")
+        with Session(dal.engine) as db:
+            db.add_all(User(username=f"student{i}", hashed_password=hashed, role="student")
+                       for i in range(args.users))
+            db.commit()
+
+        run_password_check = login_router.run_password_check
+        print(f"{'варіант':>16} {'усього, с':>10} {'вхід p50, мс':>13} "
+              f"{'інші p50':>9} {'інші p95':>9} {'інші max':>9}")
+        for title, implementation in (("на циклі подій", _blocking_password_check),
+                                      ("пул потоків", run_password_check)):
+            login_router.run_password_check = implementation
+            stats = asyncio.run(_burst(args.users, args.light))
+            print(f"{title:>16} {stats['elapsed']:>10.2f} {stats['login_p50'] * 1e3:>13.0f} "
+                  f"{stats['light_p50'] * 1e3:>9.1f} {stats['light_p95'] * 1e3:>9.1f} {stats['light_max'] * 1e3:>9.1f}")
+        login_router.run_password_check = run_password_check
+        dal.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Бенчмарк парсера чернеток.
+
+Порівнює однопрохідний parse_draft з попередньою (порядковою) реалізацією
+на синтетичних чернетках від 10 до 100 000 слайдів.
+
+Запуск:
+    python -m benchmarks.bench_parser
+"""
+import re
+import sys
+import timeit
+from typing import List
+
+from tebook.parser import parse_draft
+from tebook.slide import Slide
+from benchmarks.synthetic import generate_draft
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def legacy_parse_draft(content: str) -> List[Slide]:
+    """Попередня реалізація parse_draft (split + strip + re.match на кожен рядок)"""
+    slides = []
+    lines = content.split('\n')
+
+    current_slide_type = None
+    current_content = []
+    current_raw = []
+
+    for line in lines:
+        if line.strip().startswith('@@'):
+            continue
+
+        marker_match = re.match(r'^@([1-7])(?:\s+(.*))?$', line)
+        if marker_match:
+            if current_slide_type is not None:
+                slides.append(Slide(
+                    slide_type=f"@{current_slide_type}",
+                    content='\n'.join(current_content),
+                    raw_content='\n'.join(current_raw)
+                ))
+
+            current_slide_type = marker_match.group(1)
+            current_content = []
+            current_raw = []
+            remaining = marker_match.group(2) if marker_match.group(2) else ""
+            remaining = remaining.strip()
+            if remaining:
+                current_content.append(remaining)
+                current_raw.append(line)
+        else:
+            if current_slide_type is not None:
+                current_content.append(line)
+                current_raw.append(line)
+
+    if current_slide_type is not None:
+        slides.append(Slide(
+            slide_type=f"@{current_slide_type}",
+            content='\n'.join(current_content),
+            raw_content='\n'.join(current_raw)
+        ))
+
+    return slides
+
+
+def _best_of(func, text: str) -> float:
+    timer = timeit.Timer(lambda: func(text))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main() -> int:
+    print(f"{'слайдів':>8} {'розмір, КБ':>11} {'було, мс':>10} {'стало, мс':>10} {'прискорення':>12}")
+    for size in SIZES:
+        text = generate_draft(size)
+        if parse_draft(text) != legacy_parse_draft(text):
+            print(f"Результати парсерів відрізняються для {size} слайдів", file=sys.stderr)
+            return 1
+        legacy = _best_of(legacy_parse_draft, text)
+        current = _best_of(parse_draft, text)
+        print(f"{size:>8} {len(text.encode('utf-8')) / 1024:>11.1f} "
+              f"{legacy * 1000:>10.3f} {current * 1000:>10.3f} {legacy / current:>11.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
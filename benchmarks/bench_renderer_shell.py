@@ -0,0 +1,78 @@
+"""
+Бенчмарк статичної оболонки HTML-рендерерів.
+
+Порівнює рендеринг з готовою оболонкою (зібраною під час імпорту) з
+порядковим збиранням оболонки на кожен запит, як це робилося раніше
+(сотні html_parts.append на запит). Найбільше різниця помітна на
+невеликих презентаціях, де оболонка становить більшу частину сторінки.
+
+Запуск:
+    python -m benchmarks.bench_renderer_shell
+"""
+import sys
+import timeit
+
+from tebook import renderer as r
+from tebook.parser import parse_draft
+from benchmarks.synthetic import generate_draft
+
+SIZES = [1, 10, 100]
+DOC_TYPES = ["html-stu", "html-tut"]
+VIEW_MODES = ["slides", "document", "full-document"]
+
+
+def legacy_render(slides, doc_type: str, view_mode: str) -> str:
+    """Рендеринг зі збиранням оболонки по рядку на кожен запит"""
+    html_parts = []
+    if view_mode == "slides":
+        head, navigation, script = r._shell(r._SLIDES_SHELLS, doc_type)
+        for line in head.split('\n'):
+            html_parts.append(line)
+        for i, slide in enumerate(slides):
+            slide_class = "slide" + (" active" if i == 0 else "")
+            html_parts.append(f"        <div class='{slide_class}' id='slide-{i}'>")
+            html_parts.append(r.render_slide_content(slide))
+            html_parts.append("        </div>")
+        for line in navigation.split('\n'):
+            html_parts.append(line)
+        html_parts.append(f"    <div class='slide-counter' id='counter'>1 / {len(slides)}</div>")
+        for line in script.split('\n'):
+            html_parts.append(line)
+    else:
+        shells = r._DOCUMENT_SHELLS if view_mode == "document" else r._FULL_DOCUMENT_SHELLS
+        head, tail = r._shell(shells, doc_type)
+        for line in head.split('\n'):
+            html_parts.append(line)
+        for i, slide in enumerate(slides):
+            html_parts.append(f"        <div class='slide-block' id='block-{i}'>")
+            html_parts.append(r.render_slide_content(slide))
+            html_parts.append("        </div>")
+        for line in tail.split('\n'):
+            html_parts.append(line)
+    return '\n'.join(html_parts)
+
+
+def _best_of(func) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main() -> int:
+    print(f"{'слайдів':>8} {'тип':>9} {'режим':>14} {'було, мкс':>10} {'стало, мкс':>11} {'різниця':>8}")
+    for size in SIZES:
+        slides = parse_draft(generate_draft(size))
+        for doc_type in DOC_TYPES:
+            for view_mode in VIEW_MODES:
+                if legacy_render(slides, doc_type, view_mode) != r.render_html(slides, "python", doc_type, view_mode):
+                    print(f"Вивід відрізняється: {size} {doc_type} {view_mode}", file=sys.stderr)
+                    return 1
+                legacy = _best_of(lambda: legacy_render(slides, doc_type, view_mode))
+                current = _best_of(lambda: r.render_html(slides, "python", doc_type, view_mode))
+                print(f"{size:>8} {doc_type:>9} {view_mode:>14} {legacy * 1e6:>10.1f} {current * 1e6:>11.1f} "
+                      f"{(1 - current / legacy) * 100:>7.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
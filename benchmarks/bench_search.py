@@ -0,0 +1,68 @@
+"""
+Пошук чернеток: повнотекстовий індекс FTS5 (search_drafts) проти LIKE
+по всьому вмісту чернеток.
+
+Чернетки створюються через create_draft (індекс оновлюється разом із
+чернеткою). Крім загальних слів синтетичного словника, кожна чернетка має
+рідкісне слово "темаN", тож перевіряються і часті, і рідкісні запити.
+
+Запуск:
+    python -m benchmarks.bench_search [--drafts 5000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from tebook import dal
+from tebook.models import Draft, DraftContent
+from benchmarks.synthetic import generate_draft
+
+
+def _like_search(query: str):
+    """Пошук без індексу: усі слова запиту як підрядки назви або вмісту"""
+    statement = select(Draft.id, Draft.title).join(DraftContent, Draft.content_hash == DraftContent.hash)
+    for term in query.split():
+        statement = statement.where(Draft.title.contains(term) | DraftContent.content.contains(term))
+    with Session(dal.engine) as db:
+        return db.execute(statement.limit(dal.SEARCH_RESULTS_LIMIT)).all()
+
+
+def _time(func, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Пошук чернеток: FTS5 проти LIKE")
+    parser.add_argument("--drafts", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        dal.engine = dal.create_db_engine(os.path.join(workdir, "bench.db"))
+        dal.init_db()
+        started = time.perf_counter()
+        for i in range(args.drafts):
+            dal.create_draft(f"Чернетка {i}", generate_draft(20, seed=i) + f"\n@3 тема{i}")
+        print(f"створення {args.drafts} чернеток: {time.perf_counter() - started:.1f} с\n")
+
+        rare = f"тема{args.drafts // 2}"
+        print(f"{'запит':>24} {'FTS5, мс':>9} {'LIKE, мс':>9}")
+        for query in ("присвоєння", "цикл умова", rare, "відсутнєслово"):
+            fts = _time(lambda: dal.search_drafts(query))
+            like = _time(lambda: _like_search(query), repeat=3)
+            print(f"{query:>24} {fts * 1e3:>9.2f} {like * 1e3:>9.2f}")
+        dal.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
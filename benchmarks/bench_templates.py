@@ -0,0 +1,90 @@
+"""
+Холодний старт: перший запит /drafts/ у щойно запущеному процесі.
+
+Кожен вимір виконується в окремому процесі Python:
+
+"окремі середовища" - як було раніше: кожен роутер має власний
+    Jinja2Templates без кешу байт-коду, шаблони компілюються під час
+    першого запиту;
+"спільне, порожній кеш" - спільне середовище, шаблони компілюються під час
+    запуску (кеш байт-коду ще порожній);
+"спільне, теплий кеш" - те саме, але байт-код уже є у файловому кеші
+    (наступні воркери та перезапуски).
+
+Запуск:
+    python -m benchmarks.bench_templates
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RUNS = 5
+
+_CHILD = r"""
+import json, os, sys, time
+from sqlalchemy import create_engine
+from jinja2 import FileSystemBytecodeCache
+from fastapi.testclient import TestClient
+
+mode, workdir = sys.argv[1], sys.argv[2]
+from tebook import dal, templating
+from tebook.main import app
+from tebook.routers import drafts
+
+dal.engine = create_engine(f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+if mode == "legacy":
+    from fastapi.templating import Jinja2Templates
+    drafts.templates = Jinja2Templates(directory=str(templating.TEMPLATES_DIR))
+    templating.precompile_templates = lambda: 0
+else:
+    templating.environment.bytecode_cache = FileSystemBytecodeCache(os.path.join(workdir, "jinja"))
+
+started = time.perf_counter()
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    response = client.get("/drafts/")
+    done = time.perf_counter()
+assert response.status_code == 200
+print(json.dumps({"startup": ready - started, "first": done - ready}))
+"""
+
+
+def _run(mode: str, workdir: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _CHILD, mode, workdir],
+        capture_output=True, text=True, check=True, cwd=os.getcwd(),
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _measure(mode: str, warm: bool) -> dict:
+    startup, first = [], []
+    for _ in range(RUNS):
+        with tempfile.TemporaryDirectory() as workdir:
+            os.makedirs(os.path.join(workdir, "jinja"))
+            if warm:
+                _run(mode, workdir)
+            timing = _run(mode, workdir)
+        startup.append(timing["startup"])
+        first.append(timing["first"])
+    return {"startup": statistics.median(startup), "first": statistics.median(first)}
+
+
+def main() -> int:
+    print(f"{'варіант':>24} {'запуск, мс':>11} {'перший запит, мс':>17} {'разом, мс':>10}")
+    for title, mode, warm in (
+        ("окремі середовища", "legacy", False),
+        ("спільне, порожній кеш", "shared", False),
+        ("спільне, теплий кеш", "shared", True),
+    ):
+        timing = _measure(mode, warm)
+        total = timing["startup"] + timing["first"]
+        print(f"{title:>24} {timing['startup'] * 1e3:>11.1f} {timing['first'] * 1e3:>17.1f} {total * 1e3:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Навантажувальний тест маршрутів з паралельними запитами.
+
+Порівнює два варіанти доступу до БД в async-обробниках:
+
+"блокуючий" - функції dal викликаються прямо в циклі подій (як було раніше);
+"пул потоків" - через dal_async, у обмеженому пулі потоків.
+
+Сервер працює в тому ж процесі (ASGI-транспорт httpx), БД - тимчасовий
+файл SQLite. Запити до БД (список /drafts/ і перегляд окремих чернеток)
+змішані з легкими запитами без БД (/instructions/): для них окремо
+показано затримку, тобто наскільки вони чекають за запитами до БД.
+
+Запуск:
+    python -m benchmarks.load_test [--requests 2000] [--concurrency 32] [--drafts 300]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+
+from tebook import dal, dal_async
+from tebook.main import app
+from benchmarks.synthetic import generate_draft
+
+
+async def _blocking_run_db(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+async def _load(requests: int, concurrency: int, drafts: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    light_latencies = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        # Кожен десятий запит - список усіх чернеток, кожен четвертий - без БД,
+        # решта - окремі чернетки
+        if i % 10 == 0:
+            queue.put_nowait("/drafts/")
+        elif i % 4 == 0:
+            queue.put_nowait("/instructions/")
+        else:
+            queue.put_nowait(f"/drafts/{i % drafts + 1}")
+
+    async def worker(client: httpx.AsyncClient):
+        while not queue.empty():
+            url = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.get(url)
+            latency = time.perf_counter() - started
+            latencies.append(latency)
+            if url == "/instructions/":
+                light_latencies.append(latency)
+            assert response.status_code == 200, (url, response.status_code)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    light_latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "light_p50": statistics.median(light_latencies),
+        "light_p95": light_latencies[int(len(light_latencies) * 0.95) - 1],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--drafts", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        dal.engine = create_engine(f"sqlite:///{os.path.join(workdir, 'load.db')}")
+        dal.init_db()
+        for i in range(args.drafts):
+            dal.create_draft(f"Чернетка {i}", generate_draft(20, seed=i))
+
+        run_db = dal_async.run_db
+        print(f"{'варіант':>14} {'запитів/с':>10} {'p50, мс':>8} {'p95, мс':>8} "
+              f"{'без БД p50':>11} {'без БД p95':>11}")
+        for title, implementation in (("блокуючий", _blocking_run_db), ("пул потоків", run_db)):
+            dal_async.run_db = implementation
+            stats = asyncio.run(_load(args.requests, args.concurrency, args.drafts))
+            print(f"{title:>14} {stats['rps']:>10.0f} {stats['p50'] * 1e3:>8.1f} {stats['p95'] * 1e3:>8.1f} "
+                  f"{stats['light_p50'] * 1e3:>11.1f} {stats['light_p95'] * 1e3:>11.1f}")
+        dal_async.run_db = run_db
+        dal.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
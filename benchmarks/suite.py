@@ -0,0 +1,264 @@
+"""
+Набір бенчмарків конвеєра рендерингу з порогами регресії.
+
+Для синтетичних чернеток кількох розмірів (усі типи слайдів @1-@7,
+коментарі, стилі в тексті, CSV-таблиці) вимірюються:
+
+- parse_draft;
+- render_slide_content для кожного слайду;
+- render_html у кожному режимі відображення (slides, document, full-document);
+- render_markdown.
+
+Для кожного випадку показується медіана процесорного часу (process_time:
+інші процеси на машині на нього майже не впливають) серед повторів,
+пропускна здатність (слайдів/с) і пікове виділення пам'яті (tracemalloc,
+окремим запуском, щоб трасування не впливало на час). Кеші фрагментів і підсвітки
+очищуються перед кожним запуском: вимірюється рендеринг, а не кеш.
+
+Швидкість спільної машини змінюється з часом, тому з базовими значеннями
+порівнюється не абсолютний час, а його відношення до еталонного
+навантаження, виміряного в тих самих повторах.
+
+Результати порівнюються з benchmarks/baselines.json. Якщо час гірший за
+базовий більш ніж на --time-threshold або пам'ять більш ніж на
+--memory-threshold і це підтверджується повторним виміром, набір
+завершується з кодом 1. Базові значення залежать
+від машини: після зміни середовища їх треба перезаписати
+(--update-baselines).
+
+Запуск:
+    python -m benchmarks.suite [--sizes 10 100 1000] [--only render_html]
+    python -m benchmarks.suite --update-baselines
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from tebook.cache import fragment_cache, highlight_cache
+from tebook import highlight
+from tebook.parser import parse_draft
+from tebook.renderer import render_html, render_markdown, render_slide_content
+from benchmarks.synthetic import generate_draft
+
+SIZES = [10, 100, 1_000]
+VIEW_MODES = ["slides", "document", "full-document"]
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# Допустиме погіршення відносно базових значень
+TIME_THRESHOLD = 0.25
+MEMORY_THRESHOLD = 0.10
+# Кількість повторів і мінімальна тривалість одного повтору (с)
+REPEATS = 7
+MIN_REPEAT_TIME = 0.1
+
+
+def _environment() -> dict:
+    """Параметри середовища, від яких залежать результати"""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "pygments": highlight.highlight is not None,
+    }
+
+
+def _clear_caches():
+    fragment_cache.clear()
+    highlight_cache.clear()
+
+
+def _cases(size: int) -> Dict[str, Callable[[], object]]:
+    """Випадки для чернетки розміру size: назва -> функція без аргументів"""
+    content = generate_draft(size, seed=size)
+    slides = parse_draft(content)
+
+    def render_slides():
+        for slide in slides:
+            render_slide_content(slide, "python")
+
+    cases = {
+        f"parse_draft[{size}]": lambda: parse_draft(content),
+        f"render_slide_content[{size}]": render_slides,
+    }
+    for view_mode in VIEW_MODES:
+        cases[f"render_html:{view_mode}[{size}]"] = (
+            lambda view_mode=view_mode: render_html(slides, "python", "html-stu", view_mode)
+        )
+    cases[f"render_markdown[{size}]"] = lambda: render_markdown(slides)
+    return cases
+
+
+def _reference():
+    """Незмінне еталонне навантаження (рядки, словники, цикли), з яким порівнюється час випадків"""
+    words = {}
+    for i in range(20_000):
+        word = f"слово{i % 997}"
+        words[word] = words.get(word, 0) + len(word.upper())
+    return sum(words.values())
+
+
+def _run_repeat(func: Callable[[], object], number: int) -> float:
+    elapsed = 0.0
+    for _ in range(number):
+        _clear_caches()
+        started = time.process_time()
+        func()
+        elapsed += time.process_time() - started
+    return elapsed / number
+
+
+def _time(func: Callable[[], object]) -> Tuple[float, float]:
+    """
+    Медіана часу одного виклику серед REPEATS повторів і медіана його
+    відношення до часу еталонного навантаження.
+
+    Еталон вимірюється в кожному повторі поруч із випадком, тож відношення
+    не залежить від того, наскільки швидкою була машина саме в цей момент.
+    """
+    # Кількість викликів у повторі, щоб повтор тривав не менше MIN_REPEAT_TIME
+    single = max(_run_repeat(func, 1), 1e-6)
+    number = max(1, int(MIN_REPEAT_TIME / single))
+    reference_number = max(1, int(MIN_REPEAT_TIME / max(_run_repeat(_reference, 1), 1e-6)))
+
+    timings, ratios = [], []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            reference = _run_repeat(_reference, reference_number)
+            elapsed = _run_repeat(func, number)
+            timings.append(elapsed)
+            ratios.append(elapsed / reference)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return statistics.median(timings), statistics.median(ratios)
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    """Пікове виділення пам'яті (байти) за один виклик"""
+    _clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _measure(size: int, func: Callable[[], object]) -> dict:
+    seconds, relative = _time(func)
+    return {
+        "seconds": seconds,
+        "relative": relative,
+        "slides_per_second": size / seconds,
+        "peak_kib": _peak_memory(func) / 1024,
+    }
+
+
+def run(sizes: List[int], only: str = "", names: Optional[Set[str]] = None) -> Dict[str, dict]:
+    """
+    Виконує набір і повертає результати за назвами випадків.
+
+    Args:
+        only: Лише випадки, назва яких містить цей рядок
+        names: Лише випадки з цими назвами
+    """
+    results = {}
+    for size in sizes:
+        for name, func in _cases(size).items():
+            if only and only not in name or names is not None and name not in names:
+                continue
+            results[name] = _measure(size, func)
+    return results
+
+
+def compare(results: Dict[str, dict], baselines: Dict[str, dict],
+            time_threshold: float, memory_threshold: float) -> List[str]:
+    """Повертає описи регресій відносно базових значень"""
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        if result["relative"] > baseline["relative"] * (1 + time_threshold):
+            regressions.append(f"{name}: час {result['seconds'] * 1e3:.3f} мс, "
+                               f"{(result['relative'] / baseline['relative'] - 1) * 100:+.1f}% відносно еталона")
+        if result["peak_kib"] > baseline["peak_kib"] * (1 + memory_threshold):
+            regressions.append(f"{name}: пам'ять {result['peak_kib']:.0f} КіБ, "
+                               f"базова {baseline['peak_kib']:.0f} КіБ")
+    return regressions
+
+
+def _load_baselines(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Набір бенчмарків конвеєра рендерингу")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--only", default="", help="лише випадки, назва яких містить рядок")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    parser.add_argument("--update-baselines", action="store_true",
+                        help="записати поточні результати як базові")
+    args = parser.parse_args()
+
+    stored = _load_baselines(args.baselines)
+    baselines = stored.get("results", {})
+    results = run(args.sizes, args.only)
+
+    print(f"{'випадок':>36} {'мс':>10} {'слайдів/с':>11} {'пік, КіБ':>9} {'до базового':>12}")
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        change = f"{(result['relative'] / baseline['relative'] - 1) * 100:+.1f}%" if baseline else "-"
+        print(f"{name:>36} {result['seconds'] * 1e3:>10.3f} {result['slides_per_second']:>11.0f} "
+              f"{result['peak_kib']:>9.0f} {change:>12}")
+
+    if args.update_baselines:
+        # Записуються лише виміряні випадки, решта базових значень зберігається
+        stored = {"environment": _environment(), "results": {**baselines, **results}}
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(stored, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nБазові значення записано в {args.baselines}")
+        return 0
+
+    if not baselines:
+        print("\nБазових значень немає: запустіть з --update-baselines")
+        return 0
+    if stored.get("environment") != _environment():
+        print(f"\nУвага: базові значення виміряно в іншому середовищі ({stored.get('environment')})")
+
+    regressions = compare(results, baselines, args.time_threshold, args.memory_threshold)
+    if regressions:
+        # Випадкові сплески часу не повторюються: регресією вважається лише
+        # те, що відтворилося при повторному вимірі
+        suspects = {name for name in results if compare({name: results[name]}, baselines,
+                                                        args.time_threshold, args.memory_threshold)}
+        remeasured = run(args.sizes, names=suspects)
+        regressions = compare({name: min(results[name], remeasured[name], key=lambda r: r["relative"])
+                               for name in suspects},
+                              baselines, args.time_threshold, args.memory_threshold)
+    if regressions:
+        print("\nРегресії:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nРегресій немає")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
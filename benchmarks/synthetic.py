@@ -0,0 +1,74 @@
+"""Генератор синтетичних чернеток для бенчмарків"""
+import random
+
+_WORDS = [
+    "змінна", "значення", "команда", "присвоєння", "вираз", "пам'ять",
+    "процесор", "програма", "функція", "цикл", "умова", "список",
+    "print", "return", "while", "for", "list", "dict", "string",
+]
+
+_CODE_LINES = [
+    "a = 2 + 3",
+    "a = a + 1",
+    "for i in range(10):",
+    "    print(i * i)",
+    "if x > 0 and y < 10:",
+    "    result = {'key': [1, 2, 3]}",
+]
+
+
+def _sentence(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choice(_WORDS) for _ in range(words))
+
+
+def _text_slide(rnd: random.Random) -> str:
+    lines = []
+    for _ in range(rnd.randint(1, 4)):
+        line = _sentence(rnd, rnd.randint(4, 12))
+        kind = rnd.random()
+        if kind < 0.2:
+            line += " {{x = 5}}"
+        elif kind < 0.4:
+            line += " {" + _sentence(rnd, 2) + "}"
+        elif kind < 0.5:
+            line += " [[basic_struct.png]]"
+        lines.append(line)
+    return "@3 " + "\n".join(lines)
+
+
+def _table_slide(rnd: random.Random) -> str:
+    rows = ["Назва,Тип,Опис"]
+    for _ in range(rnd.randint(2, 6)):
+        rows.append(",".join(_sentence(rnd, 2) for _ in range(3)))
+    return "@7\n" + "\n".join(rows)
+
+
+def generate_draft(slides: int, seed: int = 0) -> str:
+    """
+    Генерує чернетку із заданою кількістю слайдів.
+
+    Містить усі типи слайдів @1-@7, коментарі, стилі в тексті та CSV-таблиці.
+    """
+    rnd = random.Random(seed)
+    parts = []
+    for i in range(slides):
+        if rnd.random() < 0.1:
+            parts.append("@@ коментар до наступного слайду")
+        kind = i % 10
+        if kind == 0:
+            parts.append(f"@1 Розділ {i // 10 + 1}")
+        elif kind == 1:
+            parts.append("@2 " + _sentence(rnd, 3))
+        elif kind in (2, 3, 4):
+            parts.append(_text_slide(rnd))
+        elif kind == 5:
+            parts.append("@4 " + _sentence(rnd, 6))
+        elif kind == 6:
+            parts.append("@5\n" + "\n".join(rnd.sample(_CODE_LINES, 3)))
+        elif kind == 7:
+            parts.append("@6 Задача: " + _sentence(rnd, 8))
+        elif kind == 8:
+            parts.append(_table_slide(rnd))
+        else:
+            parts.append("@3 ")
+    return "\n\n".join(parts) + "\n"
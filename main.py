@@ -6,7 +6,13 @@ TeBook - система для створення презентацій з че
 
 Або через FastAPI CLI:
     fastapi dev tebook/main.py
+
+Запуск через python main.py призначений для розробки: у порожній БД
+створюються тестові користувачі (якщо TEBOOK_CREATE_TEST_USERS не задано явно).
 """
+import os
+
+os.environ.setdefault("TEBOOK_CREATE_TEST_USERS", "true")
 
 from tebook.main import app
 
@@ -0,0 +1,142 @@
+"""
+Статичні ресурси презентацій (CSS та JavaScript).
+
+Файли з каталогу static/presentation віддаються за адресами з відбитком
+вмісту (наприклад, /assets/slides.3f2a9c1b04de.css), тому браузер може
+кешувати їх назавжди: зміна файлу змінює адресу. Стиснуті варіанти
+(.gz і, якщо встановлено пакет brotli, .br) будуються заздалегідь.
+
+Побудова стиснутих варіантів вручну:
+    python -m tebook.assets
+"""
+import gzip
+import hashlib
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli - необов'язкова залежність
+    brotli = None
+
+ASSETS_DIR = Path(__file__).parent / "static" / "presentation"
+ASSETS_URL = "/assets"
+
+MEDIA_TYPES = {
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+# (кодування, розширення файлу), у порядку переваги
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+@dataclass(frozen=True)
+class Asset:
+    """Статичний файл презентації"""
+    name: str
+    path: Path
+    fingerprinted: str
+    media_type: str
+
+
+def _load_assets() -> Dict[str, Asset]:
+    assets = {}
+    for path in sorted(ASSETS_DIR.iterdir()):
+        if path.suffix not in MEDIA_TYPES:
+            continue
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        assets[path.name] = Asset(
+            name=path.name,
+            path=path,
+            fingerprinted=f"{path.stem}.{digest}{path.suffix}",
+            media_type=MEDIA_TYPES[path.suffix],
+        )
+    return assets
+
+
+ASSETS = _load_assets()
+_BY_FINGERPRINT = {asset.fingerprinted: asset for asset in ASSETS.values()}
+
+
+def asset_url(name: str) -> str:
+    """Адреса ресурсу з відбитком вмісту"""
+    return f"{ASSETS_URL}/{ASSETS[name].fingerprinted}"
+
+
+def find_asset(fingerprinted: str) -> Optional[Asset]:
+    return _BY_FINGERPRINT.get(fingerprinted)
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Чи приймає клієнт кодування (з урахуванням q=0)"""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        weight = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    return weights.get(coding, weights.get("*", 0.0)) > 0
+
+
+def choose_variant(asset: Asset, accept_encoding: str) -> Tuple[Path, Optional[str]]:
+    """Повертає найкращий попередньо стиснутий варіант файлу та його кодування"""
+    for coding, suffix in ENCODINGS:
+        compressed = asset.path.with_name(asset.path.name + suffix)
+        if _accepts(accept_encoding, coding) and compressed.exists():
+            return compressed, coding
+    return asset.path, None
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Записує файл так, щоб choose_variant ніколи не побачив його недописаним"""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def build_compressed() -> int:
+    """
+    Будує стиснуті варіанти для файлів, що змінилися.
+
+    Якщо каталог ресурсів недоступний для запису (розгортання лише для
+    читання), побудова припиняється без помилки, а файли без стиснутих
+    варіантів віддаються як є.
+
+    Повертає кількість створених файлів.
+    """
+    built = 0
+    for asset in ASSETS.values():
+        data = None
+        for coding, suffix in ENCODINGS:
+            if coding == "br" and brotli is None:
+                continue
+            target = asset.path.with_name(asset.path.name + suffix)
+            if target.exists() and target.stat().st_mtime >= asset.path.stat().st_mtime:
+                continue
+            if data is None:
+                data = asset.path.read_bytes()
+            if coding == "br":
+                compressed = brotli.compress(data, quality=11)
+            else:
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            try:
+                _write_atomic(target, compressed)
+            except OSError:
+                return built
+            built += 1
+    return built
+
+
+if __name__ == "__main__":
+    print(f"Створено стиснутих файлів: {build_compressed()}")
@@ -0,0 +1,140 @@
+"""Кеші в пам'яті процесу"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+# Максимальна кількість відрендерених презентацій у кеші
+RENDER_CACHE_SIZE = 64
+# Максимальна кількість відрендерених слайдів у кеші фрагментів
+FRAGMENT_CACHE_SIZE = 4096
+# Максимальна кількість фрагментів коду з підсвіткою синтаксису
+HIGHLIGHT_CACHE_SIZE = 1024
+# Максимальна кількість розібраних чернеток у кеші слайдів
+SLIDES_CACHE_SIZE = 64
+# Максимальна кількість перевірених токенів доступу в кеші
+TOKEN_CACHE_SIZE = 1024
+# Максимальна кількість індексів рядків великих таблиць
+TABLE_CACHE_SIZE = 64
+
+
+class LRUCache:
+    """Обмежений потокобезпечний LRU-кеш з лічильниками влучань і промахів"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard(self, key: Hashable):
+        """Видаляє запис, якщо він є"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_if(self, predicate: Callable[[Hashable], bool]):
+        """Видаляє всі записи, ключі яких задовольняють умову"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """Статистика кешу: розмір, влучання, промахи"""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+@dataclass(frozen=True)
+class RenderedPage:
+    """Відрендерена презентація разом з її ETag"""
+    body: str
+    etag: str
+    # Версії зображень сторінки (ім'я, версія): заміна файлу чи поява зменшених
+    # копій робить сторінку застарілою, хоча чернетка не змінилася
+    images: Tuple[Tuple[str, Any], ...] = ()
+
+
+def make_etag(body: str) -> str:
+    """Сильний ETag, обчислений з вмісту відповіді"""
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Перевіряє заголовок If-None-Match (слабке порівняння, як вимагає RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# Ключ: (id чернетки, updated_at, doc_type, view_mode, lazy)
+render_cache = LRUCache(RENDER_CACHE_SIZE)
+
+# Ключ: хеш (тип слайду, мова для @5, вміст); спільний для всіх чернеток і форматів.
+# Значення: (фрагмент, версії зображень, на які посилається слайд)
+fragment_cache = LRUCache(FRAGMENT_CACHE_SIZE)
+
+# Ключ: (мова, хеш коду); значення - HTML коду з підсвіткою
+highlight_cache = LRUCache(HIGHLIGHT_CACHE_SIZE)
+
+# Ключ: хеш вмісту чернетки; значення - список слайдів
+slides_cache = LRUCache(SLIDES_CACHE_SIZE)
+
+# Ключ: токен доступу; значення - перевірені дані токена (sub, role, exp)
+token_cache = LRUCache(TOKEN_CACHE_SIZE)
+
+# Ключ: хеш таблиці (@7); значення - зміщення початку кожного її рядка в тексті
+table_cache = LRUCache(TABLE_CACHE_SIZE)
+
+
+def cache_stats() -> dict:
+    """Статистика всіх кешів процесу"""
+    return {
+        "render": render_cache.stats(),
+        "fragment": fragment_cache.stats(),
+        "highlight": highlight_cache.stats(),
+        "slides": slides_cache.stats(),
+        "token": token_cache.stats(),
+        "table": table_cache.stats(),
+    }
+
+
+def invalidate_draft(draft_id: int):
+    """Видаляє з кешу всі відрендерені варіанти чернетки"""
+    render_cache.discard_if(lambda key: key[0] == draft_id)
@@ -1,42 +1,333 @@
 import datetime as dt
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from .models import Draft, User, Base
+import hashlib
+import re
+from sqlalchemy import create_engine, delete, event, exists, inspect, select, text, tuple_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Sequence, Tuple
+from .cache import invalidate_draft, slides_cache
+from .models import Draft, DraftContent, User, Base
+from .parser import parse_draft, serialize_slides, deserialize_slides
+from .passwords import hash_password
+from .settings import Settings, settings
+from .slide import Slide
 
-DATA_BASE = "tebook.db"
-engine = create_engine(f"sqlite:///{DATA_BASE}", echo=False)
+DATA_BASE = settings.database_path
+
+
+def create_db_engine(path: str, config: Settings = settings) -> Engine:
+    """
+    Створює рушій SQLite з профілем налаштувань config.db_profile.
+
+    Профіль production вмикає журнал WAL (читачі не блокують запис і
+    навпаки), synchronous=NORMAL (без fsync на кожну транзакцію, безпечно
+    разом з WAL), відображення файлу в пам'ять, більший кеш сторінок і
+    очікування блокування замість негайної помилки "database is locked".
+    З'єднання тримаються в пулі, тому прагми виконуються один раз на
+    з'єднання, а не на кожну сесію.
+    """
+    if config.db_profile == "basic":
+        engine = create_engine(f"sqlite:///{path}", echo=False)
+        event.listen(engine, "connect", _enable_foreign_keys)
+        return engine
+
+    engine = create_engine(
+        f"sqlite:///{path}",
+        echo=False,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        connect_args={"timeout": config.db_busy_timeout / 1000},
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        _enable_foreign_keys(dbapi_connection, connection_record)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(config.db_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={-int(config.db_cache_size)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(config.db_busy_timeout)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record):
+    """SQLite перевіряє зовнішні ключі (drafts.content_hash) лише з цією прагмою"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+engine = create_db_engine(DATA_BASE)
 
 
 def init_db():
     """Ініціалізує базу даних, створюючи всі таблиці"""
     Base.metadata.create_all(engine)
+    _add_missing_columns()
+    _add_missing_indexes()
+    _move_inline_content()
+    _create_search_index()
+    if settings.create_test_users:
+        _create_test_users()
+
+
+def _add_missing_columns():
+    """Додає в існуючі таблиці колонки, які з'явилися в моделях пізніше"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+def _add_missing_indexes():
+    """Створює індекси, які з'явилися в моделях після створення таблиць"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _move_inline_content():
+    """
+    Переносить вміст зі старої колонки drafts.content у таблицю draft_contents.
+
+    Бази, створені до появи спільного сховища, зберігали повний текст у
+    кожному рядку drafts. Після перенесення стара колонка видаляється.
+    """
+    columns = {column["name"] for column in inspect(engine).get_columns("drafts")}
+    if "content" not in columns:
+        return
+    with Session(engine) as db:
+        _begin_write(db)
+        rows = db.execute(text("SELECT id, content FROM drafts")).all()
+        for draft_id, content in rows:
+            body = _store_content(db, content or "")
+            db.execute(update(Draft).where(Draft.id == draft_id).values(content_hash=body.hash))
+        db.commit()
+    with engine.begin() as conn:
+        for column in ("content", "slides_data"):
+            if column in columns:
+                conn.execute(text(f"ALTER TABLE drafts DROP COLUMN {column}"))
+
+
+# Вага збігу в назві відносно збігу в тексті слайдів при ранжуванні
+SEARCH_TITLE_WEIGHT = 10.0
+
+
+def _create_search_index():
+    """
+    Створює повнотекстовий індекс чернеток (FTS5) і доповнює його.
+
+    Рядок індексу має rowid, що дорівнює id чернетки. Ранжування (bm25 з
+    більшою вагою назви) зберігається в налаштуваннях індексу, тож FTS5
+    сортує збіги сам і рахує фрагменти лише для рядків сторінки результатів.
+    Чернетки, яких ще немає в індексі (створені до його появи), індексуються,
+    а рядки видалених чернеток прибираються.
+    """
+    with Session(engine) as db:
+        db.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS drafts_fts USING fts5("
+            "title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        ))
+        db.execute(
+            text("INSERT INTO drafts_fts (drafts_fts, rank) VALUES ('rank', :rank)"),
+            {"rank": f"bm25({SEARCH_TITLE_WEIGHT}, 1.0)"},
+        )
+        db.execute(text("DELETE FROM drafts_fts WHERE rowid NOT IN (SELECT id FROM drafts)"))
+        missing = db.execute(
+            select(Draft.id, Draft.title, DraftContent)
+            .join(DraftContent, Draft.content_hash == DraftContent.hash)
+            .where(text("drafts.id NOT IN (SELECT rowid FROM drafts_fts)"))
+        ).all()
+        for draft_id, title, body in missing:
+            _index_draft(db, draft_id, title, _stored_slides(body))
+        db.commit()
+
+
+def _stored_slides(body: DraftContent) -> List[Slide]:
+    """Слайди збереженого вмісту (без кешу слайдів текст розбирається заново)"""
+    if body.slides_data is not None:
+        return deserialize_slides(body.slides_data)
+    return parse_draft(body.content)
+
+
+def _search_text(slides: List[Slide]) -> str:
+    """Текст слайдів для повнотекстового індексу (без маркерів і коментарів)"""
+    return "\n".join(slide.content for slide in slides)
+
+
+def _index_draft(db: Session, draft_id: int, title: str, slides: List[Slide]):
+    """Записує (або перезаписує) чернетку в повнотекстовому індексі"""
+    db.execute(text("DELETE FROM drafts_fts WHERE rowid = :id"), {"id": draft_id})
+    db.execute(
+        text("INSERT INTO drafts_fts (rowid, title, body) VALUES (:id, :title, :body)"),
+        {"id": draft_id, "title": title, "body": _search_text(slides)},
+    )
+
+
+# Тестові користувачі (логін, пароль, роль), як на сторінці входу
+TEST_USERS = (
+    ("admin", "123456", "admin"),
+    ("teacher", "123456", "teacher"),
+    ("student", "123456", "student"),
+)
+
+
+def _create_test_users():
+    """Створює тестових користувачів, якщо в БД ще немає жодного"""
+    with Session(engine) as db:
+        if db.scalar(select(User.username).limit(1)) is not None:
+            return
+        for username, password, role in TEST_USERS:
+            db.add(User(username=username, hashed_password=hash_password(password), role=role))
+        db.commit()
+
+
+def content_hash(content: str) -> str:
+    """Хеш вмісту чернетки, за яким вміст зберігається в draft_contents"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _begin_write(db: Session):
+    """
+    Починає транзакцію сесії з блокуванням запису (BEGIN IMMEDIATE).
+
+    pysqlite відкриває транзакцію лише перед першою зміною, тож читання
+    до неї (пошук вмісту за хешем) інакше виконуються поза транзакцією, і
+    паралельне оновлення чи видалення може прибрати знайдений вміст до
+    того, як на нього послалася чернетка. Має бути першою командою сесії.
+    """
+    db.execute(text("BEGIN IMMEDIATE"))
+
+
+def _store_content(db: Session, content: str) -> DraftContent:
+    """
+    Повертає запис вмісту з таким текстом, створюючи його за потреби.
+
+    Новий вміст одразу розбирається на слайди; для вже збереженого тексту
+    (копії в інших форматах, дублікати) парсинг не повторюється.
+    Викликається в транзакції, початій _begin_write.
+    """
+    digest = content_hash(content)
+    body = db.get(DraftContent, digest)
+    if body is None:
+        db.execute(
+            insert(DraftContent)
+            .values(hash=digest, content=content, slides_data=serialize_slides(parse_draft(content)))
+            .on_conflict_do_nothing()
+        )
+        body = db.get(DraftContent, digest)
+    return body
+
+
+def _release_content(db: Session, digest: str):
+    """Видаляє вміст, на який більше не посилається жодна чернетка"""
+    db.execute(
+        delete(DraftContent)
+        .where(DraftContent.hash == digest)
+        .where(~exists().where(Draft.content_hash == digest))
+    )
+
+
+def get_draft_slides(draft: Draft) -> Optional[List[Slide]]:
+    """
+    Повертає слайди чернетки або None, якщо чернетку вже видалено.
+
+    Слайди зберігаються разом із вмістом, тому парсинг пропускається, а
+    вже десеріалізовані списки тримаються в пам'яті процесу (вміст з тим
+    самим хешем не змінюється), тож вміст читається з БД лише при промаху
+    кешу. Для вмісту без кешу (перенесеного зі старої схеми) текст
+    розбирається, а кеш записується в БД.
+    """
+    slides = slides_cache.get(draft.content_hash)
+    if slides is not None:
+        return slides
+
+    with Session(engine) as db:
+        body = db.get(DraftContent, draft.content_hash)
+        if body is None:
+            # Після читання draft паралельне оновлення чи видалення звільнило
+            # його вміст: береться поточний вміст чернетки (одним запитом)
+            current = db.get(Draft, draft.id, options=[joinedload(Draft.body)])
+            if current is None:
+                return None
+            body = current.body
+        if body.slides_data is not None:
+            slides = deserialize_slides(body.slides_data)
+        else:
+            slides = parse_draft(body.content)
+            body.slides_data = serialize_slides(slides)
+            db.commit()
+        digest = body.hash
+    slides_cache.set(digest, slides)
+    return slides
+
+
+# Користувачі
+def get_user(username: str) -> Optional[User]:
+    """Отримує користувача за логіном"""
+    with Session(engine) as db:
+        return db.get(User, username)
+
+
+def create_user(username: str, password: str, role: str) -> User:
+    """Створює користувача з паролем (зберігається лише хеш bcrypt)"""
+    with Session(engine) as db:
+        user = User(username=username, hashed_password=hash_password(password), role=role)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+    return user
+
+
+def set_password_hash(username: str, hashed_password: str):
+    """Замінює збережений хеш пароля (наприклад, після зміни вартості bcrypt)"""
+    with Session(engine) as db:
+        db.execute(update(User).where(User.username == username).values(hashed_password=hashed_password))
+        db.commit()
 
 
 # CRUD операції для чернеток
 def create_draft(title: str, content: str, language: str = "python", doc_type: str = "html-stu", view_modes: Optional[str] = None) -> Draft:
     """Створює нову чернетку"""
     now = dt.datetime.now().isoformat()
-    draft = Draft(
-        title=title,
-        content=content,
-        language=language,
-        doc_type=doc_type,
-        view_modes=view_modes,
-        created_at=now,
-        updated_at=now
-    )
     with Session(engine) as db:
+        _begin_write(db)
+        draft = Draft(
+            title=title,
+            body=_store_content(db, content),
+            language=language,
+            doc_type=doc_type,
+            view_modes=view_modes,
+            created_at=now,
+            updated_at=now
+        )
         db.add(draft)
+        db.flush()
+        _index_draft(db, draft.id, title, _stored_slides(draft.body))
         db.commit()
         db.refresh(draft)
     return draft
 
 
-def get_draft(draft_id: int) -> Optional[Draft]:
-    """Отримує чернетку за ID"""
+def get_draft(draft_id: int, with_content: bool = False) -> Optional[Draft]:
+    """
+    Отримує чернетку за ID
+
+    Args:
+        with_content: Завантажити й текст чернетки (draft.content); без нього
+            читаються лише метадані, а слайди дає get_draft_slides
+    """
     with Session(engine) as db:
-        return db.get(Draft, draft_id)
+        return db.get(Draft, draft_id, options=[joinedload(Draft.body)] if with_content else None)
 
 
 def get_all_drafts() -> List[Draft]:
@@ -45,18 +336,131 @@ def get_all_drafts() -> List[Draft]:
         return db.query(Draft).all()
 
 
+# Кількість чернеток на одній сторінці списку
+DRAFTS_PAGE_SIZE = 50
+
+# Порядок списку чернеток: колонка, за якою сортується список (від нових до старих)
+DRAFT_LIST_ORDERS = {
+    "updated": Draft.updated_at,
+    "created": Draft.created_at,
+}
+
+# Колонки, які показує список чернеток (без вмісту)
+_DRAFT_LIST_COLUMNS = (Draft.id, Draft.title, Draft.language, Draft.doc_type,
+                       Draft.view_modes, Draft.created_at, Draft.updated_at)
+
+
+def list_drafts_page(order: str = "updated", after: Optional[Tuple[str, int]] = None,
+                     limit: int = DRAFTS_PAGE_SIZE) -> Tuple[Sequence[Row], Optional[Tuple[str, int]]]:
+    """
+    Сторінка списку чернеток без їхнього вмісту.
+
+    Пагінація за ключем: наступна сторінка починається після пари
+    (значення колонки сортування, id) останньої чернетки попередньої
+    сторінки, тому запит іде по індексу і не залежить від номера сторінки.
+
+    Returns:
+        Рядки сторінки та ключ для наступної сторінки (None, якщо це остання)
+    """
+    column = DRAFT_LIST_ORDERS[order]
+    query = select(*_DRAFT_LIST_COLUMNS).order_by(column.desc(), Draft.id.desc()).limit(limit + 1)
+    if after is not None:
+        query = query.where(tuple_(column, Draft.id) < tuple_(*after))
+    with Session(engine) as db:
+        rows = db.execute(query).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, (getattr(last, column.key), last.id)
+
+
+# Максимальна кількість результатів пошуку
+SEARCH_RESULTS_LIMIT = 20
+# Кількість слів у фрагменті тексту навколо знайденого
+SEARCH_SNIPPET_WORDS = 16
+# Маркери початку і кінця знайденого слова у фрагменті (замінюються при відображенні)
+SEARCH_MATCH_START = "\x02"
+SEARCH_MATCH_END = "\x03"
+_SEARCH_TERM_RE = re.compile(r"\w+")
+
+
+def _search_query(query: str) -> Optional[str]:
+    """
+    Перетворює введений користувачем рядок на запит FTS5.
+
+    Кожне слово береться в лапки (синтаксис FTS5 у рядку не діє), усі
+    слова мають бути в чернетці, а останнє шукається як префікс, щоб
+    знаходилося ще не дописане слово.
+    """
+    terms = _SEARCH_TERM_RE.findall(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_drafts(query: str, limit: int = SEARCH_RESULTS_LIMIT) -> List[Row]:
+    """
+    Повнотекстовий пошук чернеток за назвою і текстом слайдів.
+
+    Результати впорядковані за релевантністю (bm25, збіг у назві важить
+    більше) і мають фрагмент тексту, де знайдені слова обгорнуті в
+    SEARCH_MATCH_START і SEARCH_MATCH_END.
+    """
+    match = _search_query(query)
+    if match is None:
+        return []
+    with Session(engine) as db:
+        return db.execute(
+            text(
+                "SELECT drafts.id, drafts.title, drafts.language, drafts.doc_type, drafts.view_modes, "
+                "snippet(drafts_fts, 1, :start, :end, '…', :words) AS snippet "
+                "FROM drafts_fts JOIN drafts ON drafts.id = drafts_fts.rowid "
+                "WHERE drafts_fts MATCH :match "
+                "ORDER BY drafts_fts.rank LIMIT :limit"
+            ),
+            {"match": match, "start": SEARCH_MATCH_START, "end": SEARCH_MATCH_END,
+             "words": SEARCH_SNIPPET_WORDS, "limit": limit},
+        ).all()
+
+
+def get_draft_ids(ids: Optional[List[int]] = None, doc_type: Optional[str] = None,
+                  language: Optional[str] = None) -> List[int]:
+    """
+    ID чернеток за списком ID та/або фільтром, упорядковані за ID.
+
+    Повертаються лише ID, без вмісту: для масових операцій (експорт) самі
+    чернетки завантажуються по одній, коли до них доходить черга.
+    """
+    query = select(Draft.id).order_by(Draft.id)
+    if ids:
+        query = query.where(Draft.id.in_(ids))
+    if doc_type:
+        query = query.where(Draft.doc_type == doc_type)
+    if language:
+        query = query.where(Draft.language == language)
+    with Session(engine) as db:
+        return list(db.scalars(query))
+
+
 def update_draft(draft_id: int, title: Optional[str] = None, content: Optional[str] = None,
                  language: Optional[str] = None, doc_type: Optional[str] = None, view_modes: Optional[str] = None) -> Optional[Draft]:
     """Оновлює чернетку"""
     with Session(engine) as db:
+        _begin_write(db)
         draft = db.get(Draft, draft_id)
         if not draft:
             return None
         
         if title is not None:
             draft.title = title
-        if content is not None:
-            draft.content = content
+        # Копіювання під час запису: інші чернетки зі спільним вмістом не змінюються
+        old_hash = None
+        if content is not None and content != draft.content:
+            old_hash = draft.content_hash
+            draft.body = _store_content(db, content)
         if language is not None:
             draft.language = language
         if doc_type is not None:
@@ -65,25 +469,36 @@ def update_draft(draft_id: int, title: Optional[str] = None, content: Optional[s
             draft.view_modes = view_modes
         
         draft.updated_at = dt.datetime.now().isoformat()
+        db.flush()
+        if title is not None or old_hash is not None:
+            _index_draft(db, draft.id, draft.title, _stored_slides(draft.body))
+        if old_hash is not None:
+            _release_content(db, old_hash)
         db.commit()
         db.refresh(draft)
-        return draft
+    invalidate_draft(draft_id)
+    return draft
 
 
 def delete_draft(draft_id: int) -> bool:
     """Видаляє чернетку"""
     with Session(engine) as db:
+        _begin_write(db)
         draft = db.get(Draft, draft_id)
         if not draft:
             return False
         db.delete(draft)
+        db.flush()
+        db.execute(text("DELETE FROM drafts_fts WHERE rowid = :id"), {"id": draft_id})
+        _release_content(db, draft.content_hash)
         db.commit()
-        return True
+    invalidate_draft(draft_id)
+    return True
 
 
 def duplicate_draft(draft_id: int, new_doc_type: str = None) -> Optional[Draft]:
     """Дублює чернетку, можливо змінюючи тип документа"""
-    original = get_draft(draft_id)
+    original = get_draft(draft_id, with_content=True)
     if not original:
         return None
     
@@ -0,0 +1,97 @@
+"""
+Асинхронний доступ до даних для async-маршрутів.
+
+Функції dal.py синхронні: запит до SQLite, виконаний прямо в async-обробнику,
+блокує цикл подій, і всі інші запити чекають на нього. Тут ті самі функції
+виконуються в окремому обмеженому пулі потоків, а обробник лише чекає
+на результат, не блокуючи цикл.
+"""
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+from sqlalchemy.engine import Row
+
+from . import dal
+from .metrics import stage
+from .models import Draft, User
+from .settings import settings
+from .slide import Slide
+
+# Максимальна кількість одночасних звернень до БД (дорівнює розміру пулу з'єднань)
+DB_THREADS = settings.db_pool_size
+
+T = TypeVar("T")
+
+_limiter: Optional[CapacityLimiter] = None
+
+
+def _get_limiter() -> CapacityLimiter:
+    # Створюється при першому використанні, всередині циклу подій
+    global _limiter
+    if _limiter is None:
+        _limiter = CapacityLimiter(DB_THREADS)
+    return _limiter
+
+
+async def run_db(func: Callable[..., T], *args, **kwargs) -> T:
+    """Виконує синхронну функцію доступу до БД у пулі потоків (етап "db" метрик запиту)"""
+    with stage("db"):
+        return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=_get_limiter())
+
+
+async def get_user(username: str) -> Optional[User]:
+    return await run_db(dal.get_user, username)
+
+
+async def set_password_hash(username: str, hashed_password: str):
+    await run_db(dal.set_password_hash, username, hashed_password)
+
+
+async def get_draft(draft_id: int, with_content: bool = False) -> Optional[Draft]:
+    return await run_db(dal.get_draft, draft_id, with_content)
+
+
+async def get_all_drafts() -> List[Draft]:
+    return await run_db(dal.get_all_drafts)
+
+
+async def list_drafts_page(order: str = "updated", after: Optional[Tuple[str, int]] = None,
+                           limit: int = dal.DRAFTS_PAGE_SIZE) -> Tuple[Sequence[Row], Optional[Tuple[str, int]]]:
+    return await run_db(dal.list_drafts_page, order, after, limit)
+
+
+async def search_drafts(query: str, limit: int = dal.SEARCH_RESULTS_LIMIT) -> List[Row]:
+    return await run_db(dal.search_drafts, query, limit)
+
+
+async def get_draft_ids(ids: Optional[List[int]] = None, doc_type: Optional[str] = None,
+                        language: Optional[str] = None) -> List[int]:
+    return await run_db(dal.get_draft_ids, ids, doc_type, language)
+
+
+async def get_draft_slides(draft: Draft) -> Optional[List[Slide]]:
+    # Слайди зазвичай беруться з кешу або десеріалізуються без запиту до БД,
+    # тому в метриках запиту це етап "parse", а не "db"
+    with stage("parse"):
+        return await anyio.to_thread.run_sync(partial(dal.get_draft_slides, draft), limiter=_get_limiter())
+
+
+async def create_draft(title: str, content: str, language: str = "python", doc_type: str = "html-stu",
+                       view_modes: Optional[str] = None) -> Draft:
+    return await run_db(dal.create_draft, title, content, language, doc_type, view_modes)
+
+
+async def update_draft(draft_id: int, title: Optional[str] = None, content: Optional[str] = None,
+                       language: Optional[str] = None, doc_type: Optional[str] = None,
+                       view_modes: Optional[str] = None) -> Optional[Draft]:
+    return await run_db(dal.update_draft, draft_id, title, content, language, doc_type, view_modes)
+
+
+async def delete_draft(draft_id: int) -> bool:
+    return await run_db(dal.delete_draft, draft_id)
+
+
+async def duplicate_draft(draft_id: int, new_doc_type: str = None) -> Optional[Draft]:
+    return await run_db(dal.duplicate_draft, draft_id, new_doc_type)
@@ -1,7 +1,6 @@
 """Скрипт для створення бази даних"""
-from tebook.models import Base
-from tebook.dal import engine
+from tebook.dal import init_db
 
 if __name__ == "__main__":
-    Base.metadata.create_all(engine)
+    init_db()
     print("База даних створена успішно!")
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Масовий експорт презентацій у ZIP-архів.
+
+Сторінки рендеряться паралельно в пулі процесів, а архів формується
+потоком: кожен файл стискається й одразу віддається клієнту, тому в пам'яті
+одночасно перебувають лише кілька відрендерених сторінок, а не весь архів.
+"""
+import multiprocessing
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .renderer import render_html
+from .slide import Slide
+
+# Кількість процесів для рендерингу (за замовчуванням - кількість ядер)
+EXPORT_WORKERS = os.cpu_count() or 1
+# Скільки сторінок може рендеритися наперед, поки архів записує попередні
+EXPORT_PREFETCH = EXPORT_WORKERS * 2
+
+# (ім'я файлу в архіві, слайди, мова, тип документа, режим відображення)
+ExportEntry = Tuple[str, List[Slide], str, str, str]
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Спільний пул процесів експорту (створюється при першому використанні).
+
+    Процеси запускаються через spawn, а не fork: пул створюється з потоку
+    багатопотокового сервера, і fork у момент, коли інший потік тримає
+    блокування кешу, залишив би його копію в дочірньому процесі
+    заблокованою назавжди.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=EXPORT_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(cancel_futures=True)
+            _executor = None
+
+
+def _render_entry(slides: List[Slide], language: str, doc_type: str, view_mode: str) -> bytes:
+    """Рендерить одну сторінку архіву (виконується в дочірньому процесі)"""
+    return render_html(slides, language, doc_type, view_mode).encode("utf-8")
+
+
+class _ZipStream:
+    """
+    Файлоподібний приймач для zipfile без підтримки seek.
+
+    zipfile у такому разі записує розміри після даних кожного файлу, а
+    накопичене між викликами drain() одразу передається клієнту.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(entries: Iterable[ExportEntry], executor: Optional[ProcessPoolExecutor] = None) -> Iterator[bytes]:
+    """
+    Рендерить сторінки в пулі процесів і віддає ZIP-архів шматками.
+
+    Порядок файлів в архіві збігається з порядком entries; одночасно
+    рендериться не більше EXPORT_PREFETCH сторінок.
+    """
+    executor = executor or get_executor()
+    stream = _ZipStream()
+    pending: deque = deque()
+    entries = iter(entries)
+
+    def submit_next() -> bool:
+        entry = next(entries, None)
+        if entry is None:
+            return False
+        name, slides, language, doc_type, view_mode = entry
+        pending.append((name, executor.submit(_render_entry, slides, language, doc_type, view_mode)))
+        return True
+
+    try:
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            while len(pending) < EXPORT_PREFETCH and submit_next():
+                pass
+            while pending:
+                name, future = pending.popleft()
+                archive.writestr(name, future.result())
+                submit_next()
+                yield stream.drain()
+        yield stream.drain()
+    finally:
+        for _, future in pending:
+            future.cancel()
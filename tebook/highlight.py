@@ -0,0 +1,57 @@
+"""
+Підсвітка синтаксису коду на сервері.
+
+Код слайдів @5 розбивається на токени за допомогою Pygments один раз, а
+результат зберігається в кеші за (мова, хеш коду). Кольори токенів задані
+у static/presentation/highlight.css (та highlight-tut.css), тому браузеру
+не потрібно виконувати жодного скрипта підсвітки.
+"""
+import hashlib
+from functools import lru_cache
+from typing import Optional
+
+from .cache import highlight_cache
+
+try:
+    from pygments import highlight
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+except ImportError:  # без pygments код виводиться без підсвітки
+    highlight = None
+
+# Код, довший за цю кількість символів, не підсвічується
+HIGHLIGHT_MAX_LENGTH = 64 * 1024
+
+if highlight is not None:
+    # nowrap: лише токени у <span>, обгортку <pre><code> додає рендерер
+    _FORMATTER = HtmlFormatter(nowrap=True)
+
+
+@lru_cache(maxsize=None)
+def _get_lexer(language: str):
+    if highlight is None:
+        return None
+    try:
+        return get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return None
+
+
+def highlight_code(code: str, language: str) -> Optional[str]:
+    """
+    Повертає HTML коду з підсвіткою або None, якщо мова не підтримується.
+
+    Результат вже екранований і містить лише <span> з класами токенів.
+    """
+    lexer = _get_lexer(language)
+    if lexer is None or len(code) > HIGHLIGHT_MAX_LENGTH:
+        return None
+
+    key = (language, hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest())
+    result = highlight_cache.get(key)
+    if result is None:
+        # Pygments завершує вивід переведенням рядка, якого немає в коді
+        result = highlight(code, lexer, _FORMATTER).rstrip("\n")
+        highlight_cache.set(key, result)
+    return result
@@ -0,0 +1,255 @@
+"""
+Індекс зображень, на які посилаються слайди ([[ім'я.png]]).
+
+Зображення зберігаються в каталозі static/images. Для кожного файлу один
+раз читається заголовок (PNG, JPEG, GIF), щоб дізнатися власні розміри
+зображення, а в srcset потрапляють уже створені зменшені копії. Записи
+індексу перевіряються за часом зміни файлу: заміна зображення оновлює
+розміри, а копії для нового файлу з'являються в srcset після їх побудови.
+
+Рендеринг копій не створює (Pillow стискав би зображення посеред обробки
+запиту), їх будує окрема команда (потрібен Pillow):
+    python -m tebook.images
+"""
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow - необов'язкова залежність
+    Image = None
+
+IMAGES_DIR = Path(__file__).parent / "static" / "images"
+IMAGES_URL = "/static/images"
+THUMBS_DIRNAME = ".thumbs"
+
+# Ширини зменшених копій (копії, не менші за оригінал, не створюються)
+THUMB_WIDTHS = (480, 960, 1600)
+# Формати, для яких створюються зменшені копії (GIF може бути анімованим)
+THUMB_SUFFIXES = {".png", ".jpg", ".jpeg"}
+# Як часто (у секундах) перевіряти час зміни вже проіндексованого файлу
+STAT_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """Зображення з індексу"""
+    name: str
+    width: int
+    height: int
+    mtime_ns: int
+    # (ширина, адреса) зменшених копій, за зростанням ширини
+    variants: Tuple[Tuple[int, str], ...] = ()
+
+    @property
+    def url(self) -> str:
+        return f"{IMAGES_URL}/{quote(self.name)}"
+
+
+def _png_size(header: bytes) -> Optional[Tuple[int, int]]:
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+    return None
+
+
+def _gif_size(header: bytes) -> Optional[Tuple[int, int]]:
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", header[6:10])
+    return None
+
+
+def _jpeg_size(file) -> Optional[Tuple[int, int]]:
+    """Шукає маркер SOF, пропускаючи інші сегменти (зокрема великі EXIF)"""
+    file.seek(2)
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        code = marker[1]
+        if code == 0xFF:
+            # Заповнювач перед маркером
+            file.seek(-1, os.SEEK_CUR)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length_bytes = file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            data = file.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """Повертає (ширина, висота) із заголовка PNG, GIF або JPEG"""
+    try:
+        with open(path, "rb") as file:
+            header = file.read(24)
+            size = _png_size(header) or _gif_size(header)
+            if size is None and header[:2] == b"\xff\xd8":
+                size = _jpeg_size(file)
+    except OSError:
+        return None
+    if size is None or size[0] <= 0 or size[1] <= 0:
+        return None
+    return size
+
+
+def _thumb_path(path: Path, mtime_ns: int, width: int) -> Path:
+    # Час зміни в імені: після заміни оригіналу адреса копії теж змінюється
+    return path.parent / THUMBS_DIRNAME / f"{path.stem}.{mtime_ns:x}.{width}w{path.suffix.lower()}"
+
+
+def _thumb_widths(path: Path, width: int) -> Tuple[int, ...]:
+    """Ширини зменшених копій, які потрібні зображенню"""
+    if path.suffix.lower() not in THUMB_SUFFIXES:
+        return ()
+    return tuple(target_width for target_width in THUMB_WIDTHS if target_width < width)
+
+
+def _find_variants(root: Path, path: Path, width: int, mtime_ns: int) -> Tuple[Tuple[int, str], ...]:
+    """Уже створені зменшені копії зображення"""
+    variants = []
+    for target_width in _thumb_widths(path, width):
+        thumb = _thumb_path(path, mtime_ns, target_width)
+        if thumb.exists():
+            variants.append((target_width, f"{IMAGES_URL}/{quote(thumb.relative_to(root).as_posix())}"))
+    return tuple(variants)
+
+
+def _build_variants(path: Path, width: int, height: int, mtime_ns: int):
+    """Створює зменшені копії зображення, яких ще немає"""
+    for target_width in _thumb_widths(path, width):
+        thumb = _thumb_path(path, mtime_ns, target_width)
+        if thumb.exists():
+            continue
+        tmp = thumb.with_name(f"{thumb.stem}.{os.getpid()}.tmp{thumb.suffix}")
+        try:
+            thumb.parent.mkdir(exist_ok=True)
+            with Image.open(path) as image:
+                image.thumbnail((target_width, height))
+                image.save(tmp)
+            os.replace(tmp, thumb)
+        except OSError:
+            return
+
+
+class ImageIndex:
+    """Потокобезпечний індекс зображень з перевіркою часу зміни файлів"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        # ім'я -> (час останньої перевірки, ImageInfo або None)
+        self._entries: Dict[str, Tuple[float, Optional[ImageInfo]]] = {}
+        self._lock = threading.Lock()
+
+    def _resolve(self, name: str) -> Optional[Path]:
+        """Шлях до файлу в каталозі зображень (імена поза каталогом ігноруються)"""
+        root = self.root.resolve()
+        try:
+            path = (root / name).resolve()
+        except (OSError, ValueError):
+            return None
+        if root not in path.parents or THUMBS_DIRNAME in path.relative_to(root).parts:
+            return None
+        return path
+
+    def get(self, name: str) -> Optional[ImageInfo]:
+        """Повертає зображення з індексу або None, якщо такого файлу немає"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and now - entry[0] < STAT_INTERVAL:
+            return entry[1]
+
+        path = self._resolve(name)
+        try:
+            mtime_ns = path.stat().st_mtime_ns if path else None
+        except OSError:
+            mtime_ns = None
+
+        info = entry[1] if entry is not None else None
+        if mtime_ns is None:
+            info = None
+        elif info is None or info.mtime_ns != mtime_ns:
+            size = read_image_size(path)
+            info = None
+            if size is not None:
+                width, height = size
+                variants = _find_variants(self.root.resolve(), path, width, mtime_ns)
+                info = ImageInfo(name, width, height, mtime_ns, variants)
+        else:
+            # Копії могли з'явитися відтоді (python -m tebook.images)
+            variants = _find_variants(self.root.resolve(), path, info.width, mtime_ns)
+            if variants != info.variants:
+                info = replace(info, variants=variants)
+
+        with self._lock:
+            self._entries[name] = (now, info)
+        return info
+
+    def version(self, name: str) -> Optional[Tuple[int, int]]:
+        """
+        Версія зображення з індексу: час зміни файлу і кількість готових
+        зменшених копій (None, якщо файлу немає)
+        """
+        info = self.get(name)
+        return (info.mtime_ns, len(info.variants)) if info else None
+
+    def is_current(self, versions: Iterable[Tuple[str, Optional[Tuple[int, int]]]]) -> bool:
+        """Чи не змінилися зображення з часу, коли були записані їхні версії"""
+        return all(self.version(name) == mtime_ns for name, mtime_ns in versions)
+
+
+image_index = ImageIndex(IMAGES_DIR)
+
+
+def image_tag(name: str) -> Optional[str]:
+    """
+    Тег <img> з розмірами, відкладеним завантаженням і srcset (якщо
+    зменшені копії вже створені).
+
+    Повертає None, якщо зображення немає в каталозі static/images.
+    """
+    info = image_index.get(name)
+    if info is None:
+        return None
+    attrs = f'src="{info.url}" alt="{name}" width="{info.width}" height="{info.height}" loading="lazy" decoding="async"'
+    if info.variants:
+        candidates = [f"{url} {width}w" for width, url in info.variants]
+        candidates.append(f"{info.url} {info.width}w")
+        attrs += f' srcset="{", ".join(candidates)}" sizes="(max-width: {info.width}px) 100vw, {info.width}px"'
+    return f"<img {attrs}>"
+
+
+def build_all() -> int:
+    """Створює зменшені копії всіх зображень. Повертає кількість зображень"""
+    if not IMAGES_DIR.exists():
+        return 0
+    count = 0
+    for path in sorted(IMAGES_DIR.rglob("*")):
+        if not path.is_file() or THUMBS_DIRNAME in path.relative_to(IMAGES_DIR).parts:
+            continue
+        size = read_image_size(path)
+        if size is None:
+            continue
+        _build_variants(path, size[0], size[1], path.stat().st_mtime_ns)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    if Image is None:
+        raise SystemExit("Для побудови зменшених копій потрібен пакет Pillow")
+    print(f"Оброблено зображень: {build_all()}")
@@ -1,25 +1,47 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse
-from .routers import drafts, presentations, login_router, instructions
+from fastapi.responses import PlainTextResponse, RedirectResponse
+from .routers import drafts, presentations, login_router, instructions, assets
+from .assets import build_compressed
 from .dal import init_db
+from .export import shutdown_executor
+from .metrics import MetricsMiddleware, metrics_allowed, render_metrics
+from .templating import precompile_templates
 
 app = FastAPI(title="TeBook", description="Система для створення презентацій з чернеток")
 
+app.add_middleware(login_router.TokenRenewalMiddleware)
+# Час етапів запиту (заголовок Server-Timing) і гістограми затримок для /metrics
+app.add_middleware(MetricsMiddleware)
+
 app.mount("/static", StaticFiles(directory="tebook/static"), name="static")
 
 app.include_router(drafts.router, prefix="/drafts", tags=["drafts"])
 app.include_router(presentations.router, prefix="/presentations", tags=["presentations"])
 app.include_router(login_router.router, prefix="/login", tags=["login"])
 app.include_router(instructions.router, prefix="/instructions", tags=["instructions"])
+app.include_router(assets.router, prefix="/assets", tags=["assets"])
 
 @app.get("/")
 async def root():
     """Головна сторінка - перенаправлення на список чернеток"""
     return RedirectResponse(url="/drafts/")
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Метрики у текстовому форматі Prometheus (за токеном або тільки для запитів з цієї машини)"""
+    if not metrics_allowed(request.client.host if request.client else None, request.headers):
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.on_event("startup")
 async def startup_event():
-    """Ініціалізація БД при запуску"""
-    init_db()
\ No newline at end of file
+    """Ініціалізація БД, стиснутих статичних файлів і шаблонів при запуску"""
+    init_db()
+    build_compressed()
+    precompile_templates()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Зупинка пулу процесів експорту"""
+    shutdown_executor()
@@ -0,0 +1,207 @@
+"""
+Метрики запитів.
+
+Час етапів обробки запиту (db, parse, render, template) накопичується
+в контекстній змінній запиту і повертається клієнту в заголовку
+Server-Timing (видно у вкладці Network інструментів розробника). Ті самі
+дані зводяться в гістограми затримок за маршрутом і режимом відображення,
+які віддає /metrics у текстовому форматі Prometheus.
+"""
+import hmac
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import cache_stats
+from .settings import settings
+
+# Межі кошиків гістограм затримок (секунди)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Значення мітки view_mode (інші значення зводяться до "other", щоб кількість рядів була обмеженою)
+VIEW_MODES = ("slides", "document", "full-document")
+
+
+@dataclass
+class RequestMetrics:
+    """Дані поточного запиту: сумарний час етапів і мітка режиму відображення"""
+    stages: Dict[str, float] = field(default_factory=dict)
+    view_mode: str = ""
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("tebook_request_metrics", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Додає час виконання блоку до етапу name поточного запиту"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        metrics.stages[name] = metrics.stages.get(name, 0.0) + perf_counter() - started
+
+
+def set_view_mode(view_mode: str):
+    """Позначає поточний запит режимом відображення (мітка view_mode гістограм)"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.view_mode = view_mode if view_mode in VIEW_MODES else "other"
+
+
+class Histogram:
+    """Потокобезпечна гістограма Prometheus з фіксованими кошиками"""
+
+    def __init__(self, name: str, documentation: str, label_names: Tuple[str, ...],
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        # Мітки -> [кількість у кожному кошику (не накопичувальна), сума, кількість]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), total, count))
+                            for labels, (counts, total, count) in self._series.items())
+        for labels, (counts, total, count) in series:
+            base = ",".join(f'{name}="{_label_value(value)}"' for name, value in zip(self.label_names, labels))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_duration = Histogram(
+    "tebook_request_duration_seconds", "Час обробки HTTP-запиту",
+    ("method", "route", "view_mode", "status"),
+)
+stage_duration = Histogram(
+    "tebook_stage_duration_seconds", "Час етапу обробки HTTP-запиту",
+    ("stage", "route", "view_mode"),
+)
+
+
+def server_timing(metrics: RequestMetrics, total: float) -> str:
+    """Значення заголовка Server-Timing (тривалості в мілісекундах)"""
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in metrics.stages.items()]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+def _route_label(scope: Scope) -> str:
+    """Шаблон шляху маршруту (а не сам шлях), щоб кількість рядів була обмеженою"""
+    route = scope.get("route")
+    return getattr(route, "path", "other")
+
+
+class MetricsMiddleware:
+    """
+    ASGI-middleware: вимірює час запиту та його етапів, додає заголовок
+    Server-Timing і записує виміри в гістограми.
+
+    Заголовок містить етапи, що завершилися до початку відповіді; для
+    потокових відповідей гістограма враховує час до останнього шматка тіла.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(metrics, perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = _route_label(scope)
+            request_duration.observe((scope["method"], route, metrics.view_mode, str(status)),
+                                     perf_counter() - started)
+            for name, seconds in metrics.stages.items():
+                stage_duration.observe((name, route, metrics.view_mode), seconds)
+
+
+def render_metrics() -> str:
+    """Усі метрики процесу в текстовому форматі Prometheus"""
+    lines = request_duration.render() + stage_duration.render()
+    stats = cache_stats()
+    for metric, key, kind, documentation in (
+        ("tebook_cache_hits_total", "hits", "counter", "Влучання в кеш"),
+        ("tebook_cache_misses_total", "misses", "counter", "Промахи кешу"),
+        ("tebook_cache_entries", "size", "gauge", "Кількість записів у кеші"),
+    ):
+        lines.append(f"# HELP {metric} {documentation}")
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.extend(f'{metric}{{cache="{name}"}} {values[key]}' for name, values in stats.items())
+    return "\n".join(lines) + "\n"
+
+
+# Заголовки, які додає зворотний проксі: запит через нього теж надходить з
+# 127.0.0.1, хоча клієнт може бути будь-де
+PROXY_HEADERS = ("forwarded", "x-forwarded-for", "x-real-ip")
+
+
+def is_local_client(host: Optional[str]) -> bool:
+    """Чи надійшов запит з цієї ж машини"""
+    return host is not None and (host.startswith("127.") or host == "::1")
+
+
+def metrics_allowed(host: Optional[str], headers: Mapping[str, str]) -> bool:
+    """
+    Чи можна віддати /metrics у відповідь на запит.
+
+    Якщо задано TEBOOK_METRICS_TOKEN, потрібен цей токен у заголовку
+    Authorization. Без токена дозволені лише прямі запити з цієї ж машини,
+    а запити через зворотний проксі (із заголовками PROXY_HEADERS) - ні.
+    """
+    if settings.metrics_token:
+        return hmac.compare_digest(headers.get("authorization", "").encode("utf-8"),
+                                   f"Bearer {settings.metrics_token}".encode("utf-8"))
+    return is_local_client(host) and not any(name in headers for name in PROXY_HEADERS)
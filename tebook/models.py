@@ -1,5 +1,5 @@
-from sqlalchemy import String, Text
-from sqlalchemy.orm import Mapped, DeclarativeBase, mapped_column
+from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy.orm import Mapped, DeclarativeBase, mapped_column, relationship
 from typing import Optional
 from pydantic import BaseModel
 
@@ -12,21 +12,44 @@ class User(Base):
     __tablename__ = "users"
     
     username: Mapped[str] = mapped_column(String, primary_key=True)
-    hashed_password: Mapped[bytes] = mapped_column(String)
+    hashed_password: Mapped[str] = mapped_column(String)
     role: Mapped[str] = mapped_column(String)
 
 
+class DraftContent(Base):
+    """Вміст чернетки, що зберігається один раз для всіх чернеток з однаковим текстом"""
+    __tablename__ = "draft_contents"
+
+    hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    content: Mapped[str] = mapped_column(Text)
+    # Кеш розібраних слайдів (серіалізований список)
+    slides_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
 class Draft(Base):
     __tablename__ = "drafts"
+    __table_args__ = (
+        # Для сторінок списку чернеток (пагінація за ключем)
+        Index("ix_drafts_updated_at_id", "updated_at", "id"),
+        Index("ix_drafts_created_at_id", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     title: Mapped[str] = mapped_column(String(200))
-    content: Mapped[str] = mapped_column(Text)
     language: Mapped[str] = mapped_column(String(20), default="python")
     doc_type: Mapped[str] = mapped_column(String(20), default="html-stu")
     view_modes: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     created_at: Mapped[str] = mapped_column(String(50))
     updated_at: Mapped[str] = mapped_column(String(50))
+    content_hash: Mapped[str] = mapped_column(ForeignKey("draft_contents.hash"))
+    # Вміст завантажується лише на вимогу (get_draft(..., with_content=True)):
+    # перегляд презентації, підвантаження слайдів і таблиць беруть слайди
+    # з кешу за content_hash і не читають текст чернетки з БД
+    body: Mapped[DraftContent] = relationship()
+
+    @property
+    def content(self) -> str:
+        return self.body.content
 
 
 class DraftCreate(BaseModel):
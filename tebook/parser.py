@@ -1,52 +1,97 @@
+import json
 import re
 from typing import List
 from .slide import Slide
 
+# Рядки, які цікавлять сканер: коментарі (@@...) та маркери слайдів (@1-@7).
+# Усі інші рядки копіюються у слайд суцільними шматками, без обробки по рядку.
+_SPECIAL_LINE_RE = re.compile(
+    r'^(?:[^\S\n]*@@.*|@([1-7])(?:[^\S\n]+(.*))?)$',
+    re.MULTILINE
+)
+
 
 def parse_draft(content: str) -> List[Slide]:
     """
     Парсить чернетку презентації і повертає список слайдів.
-    
+
     Коментарі (рядки, що починаються з @@) ігноруються.
+
+    Текст проглядається за один прохід: регулярний вираз знаходить лише
+    маркери та коментарі, а рядки між ними потрапляють у слайд як зрізи
+    вихідного тексту.
     """
     slides = []
-    lines = content.split('\n')
-    
+
     current_slide_type = None
     current_content = []
     current_raw = []
-    
-    for line in lines:
-        if line.strip().startswith('@@'):
+    # Позиція початку рядка, наступного за останнім обробленим спецрядком
+    position = 0
+
+    for match in _SPECIAL_LINE_RE.finditer(content):
+        start = match.start()
+        if current_slide_type is not None and start > position:
+            # Рядки між спецрядками (без '\n' перед поточним рядком)
+            chunk = content[position:start - 1]
+            current_content.append(chunk)
+            current_raw.append(chunk)
+        position = match.end() + 1
+
+        slide_type = match.group(1)
+        if slide_type is None:
+            # Коментар
             continue
 
-        marker_match = re.match(r'^@([1-7])(?:\s+(.*))?$', line)
-        if marker_match:
-            if current_slide_type is not None:
-                slides.append(Slide(
-                    slide_type=f"@{current_slide_type}",
-                    content='\n'.join(current_content),
-                    raw_content='\n'.join(current_raw)
-                ))
-
-            current_slide_type = marker_match.group(1)
-            current_content = []
-            current_raw = []
-            remaining = marker_match.group(2) if marker_match.group(2) else ""
-            remaining = remaining.strip()
-            if remaining:
-                current_content.append(remaining)
-                current_raw.append(line)
-        else:
-            if current_slide_type is not None:
-                current_content.append(line)
-                current_raw.append(line)
+        if current_slide_type is not None:
+            slides.append(Slide(
+                slide_type=f"@{current_slide_type}",
+                content='\n'.join(current_content),
+                raw_content='\n'.join(current_raw)
+            ))
+
+        current_slide_type = slide_type
+        current_content = []
+        current_raw = []
+        remaining = match.group(2)
+        remaining = remaining.strip() if remaining else ""
+        if remaining:
+            current_content.append(remaining)
+            current_raw.append(match.group(0))
 
     if current_slide_type is not None:
+        if position <= len(content):
+            chunk = content[position:]
+            current_content.append(chunk)
+            current_raw.append(chunk)
         slides.append(Slide(
             slide_type=f"@{current_slide_type}",
             content='\n'.join(current_content),
             raw_content='\n'.join(current_raw)
         ))
-    
-    return slides
\ No newline at end of file
+
+    return slides
+
+
+def serialize_slides(slides: List[Slide]) -> str:
+    """
+    Серіалізує список слайдів у компактний JSON.
+
+    Кожен слайд - [тип, вміст] або [тип, вміст, оригінал], якщо оригінальний
+    вміст відрізняється від обробленого.
+    """
+    items = []
+    for slide in slides:
+        if slide.raw_content == slide.content:
+            items.append([slide.slide_type, slide.content])
+        else:
+            items.append([slide.slide_type, slide.content, slide.raw_content])
+    return json.dumps(items, ensure_ascii=False, separators=(',', ':'))
+
+
+def deserialize_slides(data: str) -> List[Slide]:
+    """Відновлює список слайдів, серіалізований serialize_slides"""
+    return [
+        Slide(slide_type=item[0], content=item[1], raw_content=item[-1])
+        for item in json.loads(data)
+    ]
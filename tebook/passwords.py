@@ -0,0 +1,59 @@
+"""
+Хешування і перевірка паролів (bcrypt).
+
+bcrypt навмисно повільний: одна перевірка при вартості 12 займає сотні
+мілісекунд процесорного часу. Функції тут синхронні і призначені для
+виконання в окремому пулі потоків (bcrypt звільняє GIL на час хешування).
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import bcrypt
+
+from .settings import settings
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Хеш пароля з вартістю rounds (за замовчуванням - з налаштувань)"""
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("ascii")
+
+
+def hash_rounds(hashed: str) -> int:
+    """Вартість, з якою створено хеш ("$2b$12$..." -> 12)"""
+    return int(hashed.split("$")[2])
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password("")
+
+
+def _checkpw(password: str, hashed: str) -> bool:
+    # bcrypt відхиляє паролі, довші за 72 байти (ValueError): такий пароль
+    # не міг бути збережений, тож він просто не підходить
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("ascii"))
+    except ValueError:
+        return False
+
+
+def check_password(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    Перевіряє пароль за збереженим хешем.
+
+    Якщо користувача немає (hashed=None), пароль однаково перевіряється
+    за фіктивним хешем, щоб час відповіді не видавав, чи існує логін.
+
+    Returns:
+        Чи підходить пароль, і новий хеш, якщо збережений створено з
+        іншою вартістю, ніж у налаштуваннях (інакше None)
+    """
+    if hashed is None:
+        _checkpw(password, _dummy_hash())
+        return False, None
+    if not _checkpw(password, hashed):
+        return False, None
+    if hash_rounds(hashed) != settings.bcrypt_rounds:
+        return True, hash_password(password)
+    return True, None
@@ -0,0 +1,236 @@
+"""
+Попередня побудова статичного сайту з усіх чернеток.
+
+Кожна чернетка рендериться в усіх своїх режимах відображення, а результат
+записується у вихідний каталог так, щоб його міг віддавати будь-який
+статичний веб-сервер (корінь сайту - вихідний каталог):
+
+    presentations/<id>/slides.html
+    presentations/<id>/document.html
+    presentations/<id>/full-document.html
+    presentations/<id>/presentation.md      (для чернеток типу md)
+    assets/<ресурси з відбитками>
+    static/images/<зображення і зменшені копії .thumbs>
+
+Повторний запуск перебудовує лише чернетки, у яких змінилися updated_at,
+хеш вмісту або зображення, на які посилаються слайди (а також усі
+чернетки, якщо змінилися CSS/JS ресурси).
+
+Запуск:
+    python -m tebook.prebuild --output site --jobs 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .assets import ASSETS, ENCODINGS
+from .dal import get_all_drafts, get_draft_slides, init_db
+from .images import IMAGES_DIR, image_index
+from .models import Draft
+from .parser import serialize_slides, deserialize_slides
+from .renderer import image_versions, render_html
+from .slide import Slide
+
+DEFAULT_OUTPUT = "site"
+MANIFEST_NAME = ".prebuild.json"
+# Режими відображення, якщо у чернетці не обрано жодного
+DEFAULT_VIEW_MODES = ["slides", "document", "full-document"]
+
+# (id, мова, тип документа, режими відображення, серіалізовані слайди)
+BuildTask = Tuple[int, str, str, List[str], str]
+
+
+def draft_view_modes(draft: Draft) -> List[str]:
+    if draft.view_modes:
+        return [mode for mode in draft.view_modes.split(",") if mode]
+    return DEFAULT_VIEW_MODES
+
+
+def draft_pages(doc_type: str, view_modes: List[str]) -> List[Tuple[str, str]]:
+    """Пари (режим відображення, ім'я файлу) для чернетки"""
+    if doc_type == "md":
+        return [("slides", "presentation.md")]
+    return [(mode, f"{mode}.html") for mode in view_modes]
+
+
+def _assets_signature() -> str:
+    """Відбиток набору ресурсів: сторінки посилаються на них за адресами з хешем"""
+    names = sorted(asset.fingerprinted for asset in ASSETS.values())
+    return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()[:16]
+
+
+def _write_atomic(path: Path, data: str):
+    """Записує файл через тимчасовий, щоб сервер не віддав напівзаписану сторінку"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _build_draft(output: str, task: BuildTask) -> int:
+    """Рендерить усі сторінки однієї чернетки (виконується в дочірньому процесі)"""
+    draft_id, language, doc_type, view_modes, slides_data = task
+    slides = deserialize_slides(slides_data)
+    target = Path(output) / "presentations" / str(draft_id)
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+    pages = draft_pages(doc_type, view_modes)
+    for view_mode, filename in pages:
+        _write_atomic(target / filename, render_html(slides, language, doc_type, view_mode))
+    return len(pages)
+
+
+def _copy_assets(output: Path):
+    """Копіює CSS/JS ресурси (разом зі стиснутими варіантами) під адресами з відбитками"""
+    target = output / "assets"
+    target.mkdir(parents=True, exist_ok=True)
+    for asset in ASSETS.values():
+        shutil.copyfile(asset.path, target / asset.fingerprinted)
+        for _, suffix in ENCODINGS:
+            compressed = asset.path.with_name(asset.path.name + suffix)
+            if compressed.exists():
+                shutil.copyfile(compressed, target / (asset.fingerprinted + suffix))
+
+
+def _copy_images(output: Path):
+    """
+    Синхронізує каталог зображень (разом зі зменшеними копіями) з
+    output/static/images: сторінки посилаються на них за адресами /static/images/...
+
+    Копіюються лише нові та змінені файли, а файли, яких уже немає в
+    каталозі зображень, видаляються.
+    """
+    target = output / "static" / "images"
+    present = set()
+    if IMAGES_DIR.exists():
+        for path in IMAGES_DIR.rglob("*"):
+            if not path.is_file():
+                continue
+            relative = path.relative_to(IMAGES_DIR)
+            present.add(relative)
+            destination = target / relative
+            source = path.stat()
+            if destination.exists():
+                copied = destination.stat()
+                if (copied.st_size, copied.st_mtime_ns) == (source.st_size, source.st_mtime_ns):
+                    continue
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, destination)
+    if target.exists():
+        for path in target.rglob("*"):
+            if path.is_file() and path.relative_to(target) not in present:
+                path.unlink()
+
+
+def _image_version(name: str) -> Optional[List[int]]:
+    """Версія зображення у вигляді, що зберігається в маніфесті (JSON)"""
+    version = image_index.version(name)
+    return list(version) if version is not None else None
+
+
+def _images_state(slides: List[Slide]) -> Dict[str, Optional[List[int]]]:
+    """Версії зображень, на які посилаються слайди чернетки"""
+    return {name: _image_version(name) for name, _ in image_versions(slides)}
+
+
+def _is_built(entry: Optional[Dict], draft: Draft) -> bool:
+    """Чи актуальні сторінки чернетки, побудовані за записом маніфесту entry"""
+    return (entry is not None
+            and entry.get("updated_at") == draft.updated_at
+            and entry.get("content_hash") == draft.content_hash
+            and "images" in entry
+            and all(_image_version(name) == version for name, version in entry["images"].items()))
+
+
+def _load_manifest(path: Path) -> Dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def prebuild(output: str = DEFAULT_OUTPUT, jobs: int = None, force: bool = False) -> Dict[str, float]:
+    """
+    Будує статичний сайт з усіх чернеток.
+
+    Args:
+        output: Вихідний каталог
+        jobs: Кількість процесів (за замовчуванням - кількість ядер)
+        force: Перебудувати всі чернетки незалежно від маніфесту
+
+    Returns:
+        Статистика: кількість чернеток і сторінок, час та сторінок за секунду
+    """
+    output_dir = Path(output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    signature = _assets_signature()
+    manifest = {} if force else _load_manifest(manifest_path)
+    if manifest.get("assets") != signature:
+        manifest = {}
+    built = manifest.get("drafts", {})
+
+    drafts = get_all_drafts()
+    state = {}
+    tasks: List[BuildTask] = []
+    for draft in drafts:
+        key = str(draft.id)
+        if _is_built(built.get(key), draft):
+            state[key] = built[key]
+            continue
+        slides = get_draft_slides(draft)
+        if slides is None:
+            # Видалена під час побудови
+            continue
+        state[key] = {"updated_at": draft.updated_at, "content_hash": draft.content_hash,
+                      "images": _images_state(slides)}
+        tasks.append((draft.id, draft.language, draft.doc_type, draft_view_modes(draft), serialize_slides(slides)))
+
+    # Сторінки видалених чернеток
+    for key in set(built) - set(state):
+        shutil.rmtree(output_dir / "presentations" / key, ignore_errors=True)
+
+    _copy_assets(output_dir)
+    _copy_images(output_dir)
+
+    started = time.perf_counter()
+    pages = 0
+    if tasks:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outputs = [output] * len(tasks)
+            for count in executor.map(_build_draft, outputs, tasks, chunksize=max(1, len(tasks) // 64)):
+                pages += count
+    elapsed = time.perf_counter() - started
+
+    _write_atomic(manifest_path, json.dumps({"assets": signature, "drafts": state}, ensure_ascii=False, indent=1))
+    return {
+        "drafts": len(drafts),
+        "rebuilt": len(tasks),
+        "pages": pages,
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Попередня побудова статичних сторінок презентацій")
+    parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT, help="вихідний каталог")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="кількість процесів")
+    parser.add_argument("--force", action="store_true", help="перебудувати всі чернетки")
+    args = parser.parse_args()
+
+    init_db()
+    stats = prebuild(args.output, args.jobs, args.force)
+    print(f"Чернеток: {stats['drafts']}, перебудовано: {stats['rebuilt']}")
+    print(f"Сторінок: {stats['pages']} за {stats['seconds']:.2f} с "
+          f"({stats['pages_per_second']:.1f} сторінок/с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Профілювання рендерингу окремої презентації на вимогу.
+
+Конвеєр одного запиту перегляду (читання чернетки з БД, отримання
+слайдів, рендеринг HTML) виконується під cProfile і tracemalloc, а замість
+презентації повертається текстовий звіт: час етапів, найгарячіші функції
+і рядки коду з найбільшою кількістю виділених блоків пам'яті.
+
+Готова сторінка з кешу відрендерених презентацій не використовується
+(інакше профілювати нічого), кеші слайдів і фрагментів працюють як
+у звичайному запиті; їхні влучання і промахи показані у звіті.
+"""
+import cProfile
+import io
+import pstats
+import threading
+import tracemalloc
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from . import dal
+from .cache import fragment_cache, slides_cache
+from .models import Draft
+from .slide import Slide
+
+# Кількість функцій у звіті профілювальника
+PROFILE_TOP_FUNCTIONS = 30
+# Кількість рядків коду у звіті про пам'ять
+PROFILE_TOP_ALLOCATIONS = 15
+# Глибина стеку, що зберігається для кожного виділення пам'яті
+PROFILE_TRACEMALLOC_FRAMES = 1
+
+# tracemalloc глобальний для процесу, тому профілювання виконується по одному
+_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Інше профілювання ще виконується"""
+
+
+def profile_render(draft_id: int, view_mode: str, render: Callable[[Draft, List[Slide]], str]) -> Optional[str]:
+    """
+    Профілює рендеринг презентації (синхронно, в потоці, що викликає).
+
+    Args:
+        draft_id: ID чернетки
+        view_mode: Режим відображення (для заголовка звіту)
+        render: Рендеринг сторінки зі слайдів так само, як у маршруті перегляду
+
+    Returns:
+        Текстовий звіт або None, якщо чернетку не знайдено
+
+    Raises:
+        ProfilerBusy: якщо інше профілювання ще виконується
+    """
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        return _profile_render(draft_id, view_mode, render)
+    finally:
+        _lock.release()
+
+
+def _profile_render(draft_id: int, view_mode: str, render: Callable[[Draft, List[Slide]], str]) -> Optional[str]:
+    fragment_before = fragment_cache.stats()
+    slides_before = slides_cache.stats()
+    profiler = cProfile.Profile()
+    # Якщо трасування пам'яті вже ввімкнене (PYTHONTRACEMALLOC), воно не вимикається
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+    try:
+        snapshot_before = tracemalloc.take_snapshot()
+        profiler.enable()
+        try:
+            started = perf_counter()
+            draft = dal.get_draft(draft_id)
+            fetched = perf_counter()
+            if draft is None:
+                return None
+            slides = dal.get_draft_slides(draft)
+            parsed = perf_counter()
+            if slides is None:
+                return None
+            body = render(draft, slides)
+            rendered = perf_counter()
+        finally:
+            profiler.disable()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    fragment_after = fragment_cache.stats()
+    slides_after = slides_cache.stats()
+    lines = [
+        f"Профіль рендерингу презентації {draft_id} "
+        f"(doc_type={draft.doc_type}, view_mode={view_mode}, мова {draft.language})",
+        f"Слайдів: {len(slides)}, розмір сторінки: {len(body.encode('utf-8')) / 1024:.1f} КіБ",
+        "",
+        "Час етапів (завищений профілюванням):",
+        f"  db      {(fetched - started) * 1000:9.2f} мс",
+        f"  parse   {(parsed - fetched) * 1000:9.2f} мс",
+        f"  render  {(rendered - parsed) * 1000:9.2f} мс",
+        f"  усього  {(rendered - started) * 1000:9.2f} мс",
+        "",
+        "Кеші під час запиту:",
+        f"  слайди:    влучань {slides_after['hits'] - slides_before['hits']}, "
+        f"промахів {slides_after['misses'] - slides_before['misses']}",
+        f"  фрагменти: влучань {fragment_after['hits'] - fragment_before['hits']}, "
+        f"промахів {fragment_after['misses'] - fragment_before['misses']}",
+        "",
+        f"Пам'ять: пік виділень {peak / 1024:.1f} КіБ",
+        "Рядки коду з найбільшою кількістю нових блоків пам'яті (живих після рендерингу):",
+    ]
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")]
+    statistics = snapshot_after.filter_traces(filters).compare_to(
+        snapshot_before.filter_traces(filters), "lineno")
+    statistics.sort(key=lambda stat: stat.count_diff, reverse=True)
+    for stat in statistics[:PROFILE_TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        lines.append(f"  {stat.count_diff:+8d} блоків {stat.size_diff / 1024:+9.1f} КіБ  {frame.filename}:{frame.lineno}")
+
+    for sort, title in (("cumulative", "сумарним часом"), ("tottime", "власним часом")):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats(sort).print_stats(PROFILE_TOP_FUNCTIONS)
+        lines += ["", f"Функції за {title}:", stream.getvalue().strip()]
+    return "\n".join(lines) + "\n"
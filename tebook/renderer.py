@@ -1,9 +1,139 @@
+import csv
+import hashlib
+import io
+import json
 import re
-from typing import List
+from array import array
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .assets import asset_url
+from .cache import fragment_cache, table_cache
+from .highlight import highlight_code
+from .images import image_index, image_tag
+from .settings import settings
 from .slide import Slide
 
 
-def render_html(slides: List[Slide], language: str = "python", doc_type: str = "html-stu", view_mode: str = "slides") -> str:
+# Статична оболонка HTML-презентацій не залежить від слайдів, тому збирається
+# в готові рядки один раз під час імпорту модуля. Стилі та скрипти винесені
+# у файли static/presentation і підключаються за адресами з відбитком вмісту.
+# На запит рендериться тільки вміст слайдів.
+
+_SLIDES_NAVIGATION_LINES = (
+    "    <div class='navigation'>",
+    "        <button onclick='previousSlide()'>← Попередній</button>",
+    "        <button onclick='nextSlide()'>Наступний →</button>",
+    "    </div>",
+)
+
+# Малювання поверх слайдів (спільне для режимів слайдів і документа)
+_DRAWING_TOOLBAR_LINES = (
+    "    <canvas id='drawingCanvas'></canvas>",
+    "    <button class='drawing-toggle-btn' id='drawingToggleBtn' title='Малювання'>✏️</button>",
+    "    <div class='drawing-controls' id='drawingControls'>",
+    "        <button id='clearDrawing'>Очистити</button>",
+    "        <div class='color-picker'>",
+    "            <div class='color-btn active' data-color='#000000' style='background: #000000;' title='Чорний'></div>",
+    "            <div class='color-btn' data-color='#ff0000' style='background: #ff0000;' title='Червоний'></div>",
+    "            <div class='color-btn' data-color='#0000ff' style='background: #0000ff;' title='Синій'></div>",
+    "            <div class='color-btn' data-color='#00ff00' style='background: #00ff00;' title='Зелений'></div>",
+    "            <div class='color-btn' data-color='#ffff00' style='background: #ffff00;' title='Жовтий'></div>",
+    "            <div class='color-btn' data-color='#ff00ff' style='background: #ff00ff;' title='Пурпурний'></div>",
+    "            <div class='color-btn' data-color='#ffffff' style='background: #ffffff;' title='Білий'></div>",
+    "            <div class='eraser-btn' id='eraserBtn' title='Ластик'>🧹</div>",
+    "        </div>",
+    "    </div>",
+)
+
+_PAGE_END_LINES = (
+    "</body>",
+    "</html>",
+)
+
+
+def _head_lines(title: str, stylesheets: List[str]) -> List[str]:
+    """Початок HTML-сторінки до відкриття body"""
+    lines = [
+        "<!DOCTYPE html>",
+        "<html lang='uk'>",
+        "<head>",
+        "    <meta charset='UTF-8'>",
+        "    <meta name='viewport' content='width=device-width, initial-scale=1.0'>",
+        f"    <title>{title}</title>",
+        "    <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css'>",
+    ]
+    lines.extend(f"    <link rel='stylesheet' href='{asset_url(name)}'>" for name in stylesheets)
+    lines.extend(["</head>", "<body>"])
+    return lines
+
+
+def _script_lines(scripts: List[str]) -> List[str]:
+    return [f"    <script src='{asset_url(name)}'></script>" for name in scripts]
+
+
+def _join(*groups: Iterable[str]) -> str:
+    return '\n'.join(line for group in groups for line in group)
+
+
+def _build_shells(build) -> Dict[str, tuple]:
+    """Будує оболонку для кожного типу HTML-документа"""
+    return {doc_type: build(doc_type == "html-tut") for doc_type in ("html-stu", "html-tut")}
+
+
+def _tut_stylesheets(tut: bool, tut_stylesheet: str) -> List[str]:
+    """Стилі, що залежать від типу документа: тема викладача та кольори підсвітки коду"""
+    return [tut_stylesheet, "highlight-tut.css"] if tut else ["highlight.css"]
+
+
+def _shell(shells: Dict[str, tuple], doc_type: str) -> tuple:
+    # Невідомі типи документів рендеряться як студентський формат
+    return shells.get(doc_type, shells["html-stu"])
+
+
+# (до слайдів, після слайдів до лічильника, після лічильника)
+_SLIDES_SHELLS = _build_shells(lambda tut: (
+    _join(
+        _head_lines("Презентація", ["slides.css", "drawing.css"] + _tut_stylesheets(tut, "slides-tut.css")),
+        _DRAWING_TOOLBAR_LINES,
+        ["    <div class='container'>"],
+    ),
+    _join(["    </div>"], _SLIDES_NAVIGATION_LINES),
+    _join(_script_lines(["slides.js", "drawing.js", "tables.js"]), _PAGE_END_LINES),
+))
+
+# (до слайдів, після слайдів)
+_DOCUMENT_SHELLS = _build_shells(lambda tut: (
+    _join(
+        _head_lines("Презентація - Документ", ["document.css", "drawing.css"] + _tut_stylesheets(tut, "document-tut.css")),
+        _DRAWING_TOOLBAR_LINES,
+        ["    <div class='document-container'>"],
+    ),
+    _join(["    </div>"], _script_lines(["document.js", "drawing.js", "tables.js"]), _PAGE_END_LINES),
+))
+
+# (до слайдів, після слайдів); викладацькі стилі спільні з режимом документа
+_FULL_DOCUMENT_SHELLS = _build_shells(lambda tut: (
+    _join(
+        _head_lines("Документ", ["full-document.css"] + _tut_stylesheets(tut, "document-tut.css")),
+        ["    <div class='document-container'>"],
+    ),
+    _join(["    </div>"], _script_lines(["tables.js"]), _PAGE_END_LINES),
+))
+
+
+# Мінімальний розмір шматка (у символах), яким потоковий рендеринг віддає слайди
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Відкладене завантаження слайдів: скільки слайдів є на сторінці одразу,
+# скільки повертає один запит до сервера і на скільки слайдів уперед
+# клієнт підвантажує слайди заздалегідь
+LAZY_INITIAL_SLIDES = 5
+LAZY_BATCH_SLIDES = 5
+LAZY_PREFETCH_SLIDES = 3
+
+
+def render_html(slides: List[Slide], language: str = "python", doc_type: str = "html-stu", view_mode: str = "slides",
+                lazy_url: Optional[str] = None, paginate_tables: bool = False) -> str:
     """
     Генерує HTML презентацію зі списку слайдів.
 
@@ -15,260 +145,151 @@ def render_html(slides: List[Slide], language: str = "python", doc_type: str = "
             - "slides" - слайди з навігацією
             - "document" - документ з блоків (з'являються по кліку)
             - "full-document" - повний документ (всі слайди відразу)
+        lazy_url: Адреса, з якої клієнт підвантажує слайди (тільки для режиму
+            слайдів). Якщо задана, сторінка містить лише перші слайди і маніфест.
+        paginate_tables: Великі таблиці містять лише першу сторінку рядків,
+            решту клієнт підвантажує з сервера (для перегляду на сайті, не
+            для експорту).
+    """
+    return ''.join(iter_html(slides, language, doc_type, view_mode, lazy_url, paginate_tables))
+
+
+def iter_html(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+              view_mode: str = "slides", lazy_url: Optional[str] = None,
+              paginate_tables: bool = False) -> Iterator[str]:
+    """
+    Потоковий варіант render_html: віддає документ шматками.
+
+    Спочатку заголовок зі стилями, далі слайди в міру рендерингу (групами
+    не менше STREAM_CHUNK_SIZE символів), наприкінці навігація та скрипти.
+    Об'єднання шматків дає той самий документ, що й render_html.
     """
     if doc_type == "md":
-        return render_markdown(slides)
+        yield render_markdown(slides)
+        return
 
     # Режим повного документа - всі слайди відразу
     if view_mode == "full-document":
-        return render_html_full_document(slides, language, doc_type)
+        yield from iter_html_full_document(slides, language, doc_type, paginate_tables)
+        return
 
     # Режим документа - всі слайди один за одним (з'являються по кліку)
     if view_mode == "document":
-        return render_html_document(slides, language, doc_type)
+        yield from iter_html_document(slides, language, doc_type, paginate_tables)
+        return
 
     # Режим слайдів - з навігацією
-    return render_html_slides(slides, language, doc_type)
+    yield from iter_html_slides(slides, language, doc_type, lazy_url, paginate_tables)
 
 
-def render_html_slides(slides: List[Slide], language: str = "python", doc_type: str = "html-stu") -> str:
+def _iter_slide_chunks(slides: List[Slide], render_one: Callable[[int, Slide], str]) -> Iterator[str]:
+    """Рендерить слайди по одному і групує результат у шматки"""
+    buffer = []
+    size = 0
+    for i, slide in enumerate(slides):
+        part = render_one(i, slide)
+        buffer.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def render_html_slides(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                       lazy_url: Optional[str] = None, paginate_tables: bool = False) -> str:
     """Генерує HTML презентацію у режимі слайдів з навігацією"""
-    html_parts = []
-    html_parts.append("<!DOCTYPE html>")
-    html_parts.append("<html lang='uk'>")
-    html_parts.append("<head>")
-    html_parts.append("    <meta charset='UTF-8'>")
-    html_parts.append("    <meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-    html_parts.append("    <title>Презентація</title>")
-    html_parts.append("    <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css'>")
-    html_parts.append("    <style>")
-    html_parts.append("        body { position: relative; margin: 0; padding: 0; }")
-    html_parts.append("        .slide-container { position: relative; }")
-    html_parts.append("        .slide { display: none; padding: 2rem; min-height: 80vh; text-align: center; }")
-    html_parts.append("        .slide.active { display: flex; flex-direction: column; justify-content: center; align-items: center; }")
-    html_parts.append("        .slide > * { text-align: center; }")
-    html_parts.append("        .slide h1 { font-size: 2.5rem; margin-bottom: 1rem; text-align: center; }")
-    html_parts.append("        .slide h2 { font-size: 2rem; margin-bottom: 1rem; text-align: center; }")
-    html_parts.append("        .slide code { background: #f4f4f4; padding: 0.2rem 0.4rem; border-radius: 0.25rem; }")
-    html_parts.append("        .slide pre { background: #f4f4f4; padding: 1rem; border-radius: 0.5rem; overflow-x: auto; }")
-    html_parts.append("        .slide .definition { border: 2px solid #333; padding: 1rem; margin: 1rem 0; border-radius: 0.5rem; }")
-    html_parts.append("        .slide .task { background: #fff3cd; padding: 1rem; border-left: 4px solid #ffc107; margin: 1rem 0; }")
-    html_parts.append("        .slide .table-container { overflow-x: auto; margin: 1rem 0; }")
-    html_parts.append("        .slide table { width: 100%; border-collapse: collapse; }")
-    html_parts.append("        .slide table th, .slide table td { border: 1px solid #ddd; padding: 0.5rem; }")
-    html_parts.append("        .slide table th { background: #f4f4f4; }")
-    html_parts.append("        .slide .italic { font-style: italic; }")
-    html_parts.append("        .slide .bold { font-weight: bold; }")
-    html_parts.append("        .slide img { max-width: 100%; height: auto; }")
-    html_parts.append("        .navigation { position: fixed; bottom: 2rem; right: 2rem; z-index: 1000; }")
-    html_parts.append("        .navigation button { margin: 0.25rem; }")
-    html_parts.append("        .slide-counter { position: fixed; bottom: 2rem; left: 2rem; z-index: 1000; }")
-    html_parts.append("        #drawingCanvas { position: fixed; top: 0; left: 0; width: 100%; height: 100%; z-index: 500; pointer-events: none; }")
-    html_parts.append("        #drawingCanvas.drawing { pointer-events: all; }")
-    html_parts.append("        .drawing-toggle-btn { position: fixed; top: 2rem; right: 2rem; z-index: 1001; width: 50px; height: 50px; border-radius: 50%; background: #0066cc; color: white; border: none; cursor: pointer; font-size: 24px; box-shadow: 0 2px 8px rgba(0,0,0,0.3); display: flex; align-items: center; justify-content: center; }")
-    html_parts.append("        .drawing-toggle-btn:hover { background: #0052a3; }")
-    html_parts.append("        .drawing-controls { position: fixed; top: 6rem; right: 2rem; z-index: 1001; background: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 8px rgba(0,0,0,0.2); display: none; }")
-    html_parts.append("        .drawing-controls.visible { display: block; }")
-    html_parts.append("        .drawing-controls button { margin: 0.25rem; display: block; width: 100%; }")
-    html_parts.append("        .color-picker { display: flex; gap: 0.5rem; margin: 0.5rem 0; flex-wrap: wrap; }")
-    html_parts.append("        .color-btn { width: 30px; height: 30px; border: 2px solid #333; border-radius: 50%; cursor: pointer; }")
-    html_parts.append("        .color-btn.active { border-color: #0066cc; border-width: 3px; }")
-    html_parts.append("        .eraser-btn { width: 30px; height: 30px; border: 2px solid #333; border-radius: 4px; cursor: pointer; background: white; display: flex; align-items: center; justify-content: center; font-size: 18px; }")
-    html_parts.append("        .eraser-btn.active { border-color: #0066cc; border-width: 3px; background: #f0f0f0; }")
-
-    # Додаткові стилі для викладацького формату
-    if doc_type == "html-tut":
-        html_parts.append("        /* Викладацький формат - розширені стилі */")
-        html_parts.append("        .slide { background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); }")
-        html_parts.append("        .slide h1 { color: #1a237e; text-shadow: 2px 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide h2 { color: #283593; border-bottom: 2px solid #3f51b5; padding-bottom: 0.5rem; }")
-        html_parts.append("        .slide .definition { background: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1); border-left: 5px solid #3f51b5; }")
-        html_parts.append("        .slide .task { background: linear-gradient(135deg, #fff3cd 0%, #ffe082 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide code { background: #263238; color: #aed581; font-weight: bold; }")
-        html_parts.append("        .slide pre { background: #263238; color: #aed581; border: 2px solid #37474f; }")
-        html_parts.append("        .slide table { box-shadow: 0 2px 8px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide table th { background: linear-gradient(135deg, #3f51b5 0%, #5c6bc0 100%); color: white; font-weight: bold; }")
-        html_parts.append("        .slide table tr:nth-child(even) { background: #f5f5f5; }")
-        html_parts.append("        .slide table tr:hover { background: #e3f2fd; transition: background 0.3s; }")
-
-    html_parts.append("    </style>")
-    html_parts.append("</head>")
-    html_parts.append("<body>")
-    html_parts.append("    <canvas id='drawingCanvas'></canvas>")
-    html_parts.append("    <button class='drawing-toggle-btn' id='drawingToggleBtn' title='Малювання'>✏️</button>")
-    html_parts.append("    <div class='drawing-controls' id='drawingControls'>")
-    html_parts.append("        <button id='clearDrawing'>Очистити</button>")
-    html_parts.append("        <div class='color-picker'>")
-    html_parts.append("            <div class='color-btn active' data-color='#000000' style='background: #000000;' title='Чорний'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#ff0000' style='background: #ff0000;' title='Червоний'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#0000ff' style='background: #0000ff;' title='Синій'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#00ff00' style='background: #00ff00;' title='Зелений'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#ffff00' style='background: #ffff00;' title='Жовтий'></div>")
-    html_parts.append( "            <div class='color-btn' data-color='#ff00ff' style='background: #ff00ff;' title='Пурпурний'></div>")
-    html_parts.append( "            <div class='color-btn' data-color='#ffffff' style='background: #ffffff;' title='Білий'></div>")
-    html_parts.append("            <div class='eraser-btn' id='eraserBtn' title='Ластик'>🧹</div>")
-    html_parts.append("        </div>")
-    html_parts.append("    </div>")
-    html_parts.append("    <div class='container'>")
+    return ''.join(iter_html_slides(slides, language, doc_type, lazy_url, paginate_tables))
+
+
+def iter_html_slides(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                     lazy_url: Optional[str] = None, paginate_tables: bool = False) -> Iterator[str]:
+    """Потоковий варіант render_html_slides"""
+    head, navigation, script = _shell(_SLIDES_SHELLS, doc_type)
+    yield head
 
     # Генеруємо слайди
-    for i, slide in enumerate(slides):
-        slide_class = "slide" + (" active" if i == 0 else "")
-        html_parts.append(f"        <div class='{slide_class}' id='slide-{i}'>")
-        html_parts.append(render_slide_content(slide))
-        html_parts.append("        </div>")
-
-    html_parts.append("    </div>")
-
-    # Навігація
-    html_parts.append("    <div class='navigation'>")
-    html_parts.append("        <button onclick='previousSlide()'>← Попередній</button>")
-    html_parts.append("        <button onclick='nextSlide()'>Наступний →</button>")
-    html_parts.append("    </div>")
-    html_parts.append(f"    <div class='slide-counter' id='counter'>1 / {len(slides)}</div>")
-
-    # JS для навігації та малювання
-    html_parts.append("    <script>")
-    html_parts.append("        let currentSlide = 0;")
-    html_parts.append("        const slides = document.querySelectorAll('.slide');")
-    html_parts.append("        const totalSlides = slides.length;")
-    html_parts.append("")
-    html_parts.append("        function showSlide(n) {")
-    html_parts.append("            slides.forEach(s => s.classList.remove('active'));")
-    html_parts.append("            if (n >= totalSlides) currentSlide = 0;")
-    html_parts.append("            if (n < 0) currentSlide = totalSlides - 1;")
-    html_parts.append("            if (n >= 0 && n < totalSlides) currentSlide = n;")
-    html_parts.append("            slides[currentSlide].classList.add('active');")
-    html_parts.append("            document.getElementById('counter').textContent = `${currentSlide + 1} / ${totalSlides}`;")
-    html_parts.append("        }")
-    html_parts.append("")
-    html_parts.append("        function nextSlide() { showSlide(currentSlide + 1); }")
-    html_parts.append("        function previousSlide() { showSlide(currentSlide - 1); }")
-    html_parts.append("")
-    html_parts.append("        document.addEventListener('keydown', (e) => {")
-    html_parts.append("            if (e.key === 'ArrowRight' || e.key === ' ') nextSlide();")
-    html_parts.append("            if (e.key === 'ArrowLeft') previousSlide();")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        // Малювання")
-    html_parts.append("        const canvas = document.getElementById('drawingCanvas');")
-    html_parts.append("        const ctx = canvas.getContext('2d');")
-    html_parts.append("        let isDrawing = false;")
-    html_parts.append("        let currentColor = '#000000';")
-    html_parts.append("")
-    html_parts.append("        function resizeCanvas() {")
-    html_parts.append("            canvas.width = window.innerWidth;")
-    html_parts.append("            canvas.height = window.innerHeight;")
-    html_parts.append("        }")
-    html_parts.append("        resizeCanvas();")
-    html_parts.append("        window.addEventListener('resize', resizeCanvas);")
-    html_parts.append("")
-    html_parts.append("        let isDrawingMode = false;")
-    html_parts.append("        let isEraser = false;")
-    html_parts.append("        ")
-    html_parts.append("        const drawingToggleBtn = document.getElementById('drawingToggleBtn');")
-    html_parts.append("        const drawingControls = document.getElementById('drawingControls');")
-    html_parts.append("        ")
-    html_parts.append("        drawingToggleBtn.addEventListener('click', function() {")
-    html_parts.append("            if (drawingControls.classList.contains('visible')) {")
-    html_parts.append("                drawingControls.classList.remove('visible');")
-    html_parts.append("                canvas.classList.remove('drawing');")
-    html_parts.append("                isDrawingMode = false;")
-    html_parts.append("            } else {")
-    html_parts.append("                drawingControls.classList.add('visible');")
-    html_parts.append("                canvas.classList.add('drawing');")
-    html_parts.append("                isDrawingMode = true;")
-    html_parts.append("            }")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        document.getElementById('clearDrawing').addEventListener('click', function() {")
-    html_parts.append("            ctx.clearRect(0, 0, canvas.width, canvas.height);")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        document.querySelectorAll('.color-btn').forEach(btn => {")
-    html_parts.append("            btn.addEventListener('click', function() {")
-    html_parts.append("                document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));")
-    html_parts.append("                if (document.getElementById('eraserBtn')) {")
-    html_parts.append("                    document.getElementById('eraserBtn').classList.remove('active');")
-    html_parts.append("                }")
-    html_parts.append("                this.classList.add('active');")
-    html_parts.append("                currentColor = this.getAttribute('data-color');")
-    html_parts.append("                isEraser = false;")
-    html_parts.append("            });")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        if (document.getElementById('eraserBtn')) {")
-    html_parts.append("            document.getElementById('eraserBtn').addEventListener('click', function() {")
-    html_parts.append("                document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));")
-    html_parts.append("                this.classList.toggle('active');")
-    html_parts.append("                isEraser = this.classList.contains('active');")
-    html_parts.append("            });")
-    html_parts.append("        }")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mousedown', function(e) {")
-    html_parts.append("            if (!isDrawingMode) return;")
-    html_parts.append("            e.stopPropagation();")
-    html_parts.append("            isDrawing = true;")
-    html_parts.append("            ctx.beginPath();")
-    html_parts.append("            ctx.moveTo(e.clientX, e.clientY);")
-    html_parts.append("            if (isEraser) {")
-    html_parts.append("                ctx.globalCompositeOperation = 'destination-out';")
-    html_parts.append("                ctx.lineWidth = 10;")
-    html_parts.append("            } else {")
-    html_parts.append("                ctx.globalCompositeOperation = 'source-over';")
-    html_parts.append("                ctx.strokeStyle = currentColor;")
-    html_parts.append("                ctx.lineWidth = 3;")
-    html_parts.append("            }")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mousemove', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.stopPropagation();")
-    html_parts.append("            ctx.lineTo(e.clientX, e.clientY);")
-    html_parts.append("            ctx.lineCap = 'round';")
-    html_parts.append("            ctx.stroke();")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mouseup', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mouseleave', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        // Touch events for mobile")
-    html_parts.append("        canvas.addEventListener('touchstart', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.preventDefault();")
-    html_parts.append("            const touch = e.touches[0];")
-    html_parts.append("            ctx.beginPath();")
-    html_parts.append("            ctx.moveTo(touch.clientX, touch.clientY);")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('touchmove', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.preventDefault();")
-    html_parts.append("            const touch = e.touches[0];")
-    html_parts.append("            ctx.lineTo(touch.clientX, touch.clientY);")
-    html_parts.append("            ctx.strokeStyle = currentColor;")
-    html_parts.append("            ctx.lineWidth = 3;")
-    html_parts.append("            ctx.lineCap = 'round';")
-    html_parts.append("            ctx.stroke();")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('touchend', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("    </script>")
-    html_parts.append("</body>")
-    html_parts.append("</html>")
+    initial = slides[:LAZY_INITIAL_SLIDES] if lazy_url else slides
+    yield from _iter_slide_chunks(initial, lambda i, slide: '\n' + _slide_div(i, slide, language, paginate_tables))
+
+    yield f"\n{navigation}\n    <div class='slide-counter' id='counter'>1 / {len(slides)}</div>"
+    if lazy_url:
+        manifest = json.dumps({
+            "total": len(slides),
+            "url": lazy_url,
+            "batch": LAZY_BATCH_SLIDES,
+            "prefetch": LAZY_PREFETCH_SLIDES,
+        })
+        yield f"\n    <script type='application/json' id='slidesManifest'>{manifest}</script>"
+    yield '\n' + script
+
+
+def _slide_div(i: int, slide: Slide, language: str, paginate_tables: bool = False) -> str:
+    slide_class = "slide" + (" active" if i == 0 else "")
+    content = render_slide_content(slide, language, paginate_tables)
+    return f"        <div class='{slide_class}' id='slide-{i}'>\n{content}\n        </div>"
+
+
+def render_slide_fragments(slides: List[Slide], start: int, count: int, language: str = "python") -> str:
+    """Рендерить слайди start..start+count-1 для відкладеного завантаження"""
+    return '\n'.join(_slide_div(i, slides[i], language, paginate_tables=True)
+                     for i in range(start, min(start + count, len(slides))))
+
+
+# Фрагменти, довші за цю кількість символів, у кеш не потрапляють
+FRAGMENT_CACHE_MAX_LENGTH = 256 * 1024
+
+
+def render_slide_content(slide: Slide, language: str = "python", paginate_tables: bool = False) -> str:
+    """
+    Рендерить вміст одного слайду.
+
+    Результат залежить тільки від типу і вмісту слайду (а для коду @5 - ще
+    й від мови, для таблиць @7 - від розбиття на сторінки), тому кешується
+    за їхнім хешем: однакові слайди в різних чернетках і форматах
+    рендеряться один раз.
+    """
+    if slide.slide_type == "@5":
+        variant = language
+    elif slide.slide_type == "@7" and paginate_tables:
+        variant = "paginated"
+    else:
+        variant = ""
+    key = hashlib.blake2b(f"{slide.slide_type}\0{variant}\0{slide.content}".encode("utf-8"), digest_size=16).digest()
+    entry = fragment_cache.get(key)
+    # Розміри і srcset зображень у фрагменті залежать від файлів, тому разом із
+    # фрагментом зберігаються версії зображень, на які він посилається
+    if entry is not None and (not entry[1] or image_index.is_current(entry[1])):
+        return entry[0]
+
+    images = tuple((name, image_index.version(name)) for name in _image_links(slide))
+    fragment = _render_slide_content(slide, language, paginate_tables)
+    if len(fragment) <= FRAGMENT_CACHE_MAX_LENGTH:
+        fragment_cache.set(key, (fragment, images))
+    return fragment
+
+
+_LINK_RE = re.compile(r'\[\[([^\]]+)\]\]')
+
+
+def image_versions(slides: List[Slide]) -> tuple:
+    """Версії всіх локальних зображень, на які посилаються слайди (для кешу сторінок)"""
+    names = dict.fromkeys(name for slide in slides for name in _image_links(slide))
+    return tuple((name, image_index.version(name)) for name in names)
 
-    return '\n'.join(html_parts)
 
+def _image_links(slide: Slide) -> List[str]:
+    """Посилання на локальні зображення в тексті слайду"""
+    if slide.slide_type in ("@5", "@7") or '[[' not in slide.content:
+        return []
+    return [link for link in _LINK_RE.findall(slide.content)
+            if not link.startswith(('http://', 'https://'))]
 
-def render_slide_content(slide: Slide) -> str:
-    """Рендерить вміст одного слайду"""
+
+def _render_slide_content(slide: Slide, language: str = "python", paginate_tables: bool = False) -> str:
+    """Рендерить вміст одного слайду без кешу"""
     content = slide.content.strip() if slide.content else ""
 
     if slide.slide_type == "@1":
@@ -287,9 +308,8 @@ def render_slide_content(slide: Slide) -> str:
         # Основний текст з підтримкою стилів
         if not content:
             return "            <div></div>"
-        processed = process_text(content)
         # Латинські слова - курсив
-        processed = process_latin_italic(processed)
+        processed = process_text(content, latin_italic=True)
         return f"            <div>{processed}</div>"
 
     elif slide.slide_type == "@4":
@@ -302,7 +322,10 @@ def render_slide_content(slide: Slide) -> str:
     elif slide.slide_type == "@5":
         # Багаторядковий код
         code_content = content.strip() if content else ""
-        return f"            <pre><code>{escape_html(code_content)}</code></pre>"
+        highlighted = highlight_code(code_content, language)
+        if highlighted is None:
+            return f"            <pre><code>{escape_html(code_content)}</code></pre>"
+        return f"            <pre><code class='highlight language-{escape_html(language)}'>{highlighted}</code></pre>"
 
     elif slide.slide_type == "@6":
         # Задача
@@ -315,383 +338,219 @@ def render_slide_content(slide: Slide) -> str:
         # Таблиця (CSV)
         if not content:
             return "            <div class='table-container'><p>Порожня таблиця</p></div>"
-        return render_table(content)
+        return render_table(content, paginate_tables)
 
     return f"            <div>{process_text(content) if content else ''}</div>"
 
 
-def process_text(text: str) -> str:
+# Вбудована розмітка тексту слайдів. Усі конструкції розбираються одним
+# регулярним виразом за один прохід зліва направо; згенерований HTML
+# повторно не сканується. Результат збігається з попередньою обробкою
+# послідовними re.sub ({{код}}, потім {виділений}), зокрема для коду у
+# виділеному тексті і фігурних дужок у коді (benchmarks/bench_inline.py).
+_CODE = r'\{\{[^}]+\}\}'
+# Текст до найближчої } поза кодом: фрагменти коду або символи, що не починають код
+_UNTIL_BRACE = rf'(?:{_CODE}|(?!{_CODE})[^}}])'
+_INLINE_PATTERN = (
+    # Код з { всередині: як і раніше, виділення починається з цієї дужки
+    # і закінчується найближчою } після коду
+    rf'\{{\{{(?P<code_head>[^{{}}]*)\{{(?P<code_rest>[^}}]*)\}}\}}(?P<code_tail>{_UNTIL_BRACE}*)\}}'
+    rf'|\{{\{{(?P<code>[^}}]+)\}}\}}'
+    rf'|\{{(?P<strong>{_UNTIL_BRACE}+)\}}'
+    r'|\[\[(?P<link>[^\]]+)\]\]'
+    r'|(?P<newline>\n)'
+)
+_INLINE_RE = re.compile(_INLINE_PATTERN)
+# Те саме плюс латинські слова (для слайдів @3)
+_INLINE_LATIN_RE = re.compile(_INLINE_PATTERN + r'|\b(?P<latin>[a-zA-Z]{2,})\b')
+
+
+def process_text(text: str, latin_italic: bool = False) -> str:
     """
-    Обробляє текст слайду @3:
+    Обробляє текст слайду:
     - {{код}} -> <code>код</code>
     - {виділений} -> <strong>виділений</strong>
     - [[посилання]] -> <img src="посилання" alt="посилання">
+    - переноси рядків -> <br>
+    - латинські слова -> <span class="italic">...</span> (якщо latin_italic)
+
+    Латинські слова виділяються тільки у звичайному та виділеному тексті,
+    код і посилання залишаються без змін.
     """
-    # Подвійні фігурні дужки - код
-    text = re.sub(r'\{\{([^}]+)\}\}', r'<code>\1</code>', text)
+    pattern = _INLINE_LATIN_RE if latin_italic else _INLINE_RE
 
-    # Одинарні фігурні дужки - виділений текст
-    text = re.sub(r'\{([^}]+)\}', r'<strong>\1</strong>', text)
+    def replace(match):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'code':
+            return '<code>' + value.replace('\n', '<br>') + '</code>'
+        if kind == 'code_tail':
+            head, rest = (part.replace('\n', '<br>') for part in match.group('code_head', 'code_rest'))
+            return f'<code>{head}<strong>{rest}</code>{pattern.sub(replace, value)}</strong>'
+        if kind == 'strong':
+            return f'<strong>{pattern.sub(replace, value)}</strong>'
+        if kind == 'link':
+            return process_link(value)
+        if kind == 'newline':
+            return '<br>'
+        return f'<span class="italic">{value}</span>'
 
-    # Подвійні квадратні дужки - посилання/зображення
-    def process_link(match):
-        link = match.group(1)
-        if link.startswith('http://') or link.startswith('https://'):
-            return f'<a href="{link}" target="_blank">{link}</a>'
-        return f'<img src="{link}" alt="{link}">'
+    return pattern.sub(replace, text)
 
-    text = re.sub(r'\[\[([^\]]+)\]\]', process_link, text)
 
-    # Замінюємо переноси рядків на <br>
-    text = text.replace('\n', '<br>')
+def process_link(link: str) -> str:
+    """[[посилання]] -> посилання або зображення"""
+    if link.startswith('http://') or link.startswith('https://'):
+        return f'<a href="{link}" target="_blank">{link}</a>'
+    # Зображення з static/images отримують розміри, srcset і відкладене завантаження
+    return image_tag(link) or f'<img src="{link}" alt="{link}">'
 
-    return text
 
+# Таблиці з більшою кількістю рядків (без заголовка) при перегляді на сайті
+# містять лише першу сторінку, решта підвантажується сторінками такого розміру
+TABLE_PAGE_ROWS = settings.table_page_rows
 
-def process_latin_italic(text: str) -> str:
-    """Перетворює латинські слова на курсив"""
 
-    def italicize_latin(match):
-        word = match.group(0)
-        return f'<span class="italic">{word}</span>'
+def table_hash(csv_content: str) -> str:
+    """Ідентифікатор таблиці в адресі сторінок її рядків"""
+    return hashlib.blake2b(csv_content.encode("utf-8"), digest_size=8).hexdigest()
 
-    text = re.sub(r'\b[a-zA-Z]{2,}\b', italicize_latin, text)
-    return text
 
+def _iter_table_rows(text: str, start: int = 0) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Читає рядки таблиці по одному, починаючи зі зміщення start, і пропускає
+    порожні. Повертає пари (зміщення початку рядка в text, клітинки).
+
+    Текст читається одним потоковим csv.reader, тож поле в лапках може
+    містити коми і переноси рядків. Якщо лапку не закрито (csv.Error у
+    строгому режимі), рядок тексту, з якого почався запис, розбивається
+    просто за комами, а CSV читається далі з наступного рядка: непарна
+    лапка не поглинає решту таблиці.
+    """
+    source = io.StringIO(text)
+    source.seek(start)
+    reader = csv.reader(source, skipinitialspace=True, strict=True)
+    while True:
+        offset = source.tell()
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error:
+            source.seek(offset)
+            row = source.readline().rstrip('\n').split(',')
+            reader = csv.reader(source, skipinitialspace=True, strict=True)
+        if len(row) > 1 or (row and row[0].strip()):
+            yield offset, [cell.strip() for cell in row]
+
+
+def _table_row_offsets(text: str) -> array:
+    """
+    Зміщення початку кожного рядка таблиці (разом із заголовком).
 
-def render_table(csv_content: str) -> str:
-    """Рендерить таблицю з CSV даних"""
-    lines = [line.strip() for line in csv_content.strip().split('\n') if line.strip()]
-    if not lines:
-        return "            <div>Порожня таблиця</div>"
+    Таблиця розбирається повністю один раз, а індекс зберігається в кеші:
+    кількість сторінок і будь-яка сторінка рядків далі читаються без
+    розбору попередніх рядків.
+    """
+    key = table_hash(text)
+    offsets = table_cache.get(key)
+    if offsets is None:
+        offsets = array('q', (offset for offset, _ in _iter_table_rows(text)))
+        table_cache.set(key, offsets)
+    return offsets
+
+
+def _table_row(cells: List[str], tag: str) -> str:
+    parts = ["                    <tr>"]
+    parts.extend(f"                        <{tag}>{escape_html(cell)}</{tag}>" for cell in cells)
+    parts.append("                    </tr>")
+    return '\n'.join(parts)
 
-    html_parts = ["            <div class='table-container'>", "                <table>"]
 
-    for i, line in enumerate(lines):
-        cells = [cell.strip() for cell in line.split(',')]
-        tag = 'th' if i == 0 else 'td'
-        html_parts.append("                    <tr>")
-        for cell in cells:
-            html_parts.append(f"                        <{tag}>{escape_html(cell)}</{tag}>")
-        html_parts.append("                    </tr>")
+def render_table(csv_content: str, paginate: bool = False) -> str:
+    """
+    Рендерить таблицю з CSV даних.
+
+    Якщо paginate, у таблицю потрапляють лише перші TABLE_PAGE_ROWS рядків і
+    кнопка, за якою клієнт підвантажує наступні сторінки (tables.js).
+    """
+    text = csv_content.strip()
+    rows = _iter_table_rows(text)
+    header = next(rows, None)
+    if header is None:
+        return "            <div>Порожня таблиця</div>"
 
+    html_parts = ["            <div class='table-container'>", "                <table>", _table_row(header[1], 'th')]
+    html_parts.extend(_table_row(cells, 'td') for _, cells in islice(rows, TABLE_PAGE_ROWS if paginate else None))
     html_parts.append("                </table>")
+
+    remaining = len(_table_row_offsets(text)) - 1 - TABLE_PAGE_ROWS if paginate else 0
+    if remaining > 0:
+        pages = 1 + (remaining + TABLE_PAGE_ROWS - 1) // TABLE_PAGE_ROWS
+        html_parts.append(
+            f"                <button class='table-more' data-table='{table_hash(csv_content)}' "
+            f"data-page='1' data-pages='{pages}'>Показати ще {remaining} рядків</button>"
+        )
     html_parts.append("            </div>")
 
     return '\n'.join(html_parts)
 
 
-def render_html_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu") -> str:
+def render_table_page(csv_content: str, page: int) -> str:
+    """Рядки сторінки page (з нуля, без заголовка) для підвантаження клієнтом"""
+    text = csv_content.strip()
+    offsets = _table_row_offsets(text)
+    start = 1 + page * TABLE_PAGE_ROWS
+    if start >= len(offsets):
+        return ''
+    rows = _iter_table_rows(text, offsets[start])
+    return '\n'.join(_table_row(cells, 'td') for _, cells in islice(rows, TABLE_PAGE_ROWS))
+
+
+def render_html_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                         paginate_tables: bool = False) -> str:
     """
     Генерує HTML документ зі слайдів (всі слайди один за одним, як блоки).
     Спочатку показується перший слайд, далі з'являються наступні при прокрутці.
     Вирівнювання по лівому краю.
     """
-    html_parts = []
-    html_parts.append("<!DOCTYPE html>")
-    html_parts.append("<html lang='uk'>")
-    html_parts.append("<head>")
-    html_parts.append("    <meta charset='UTF-8'>")
-    html_parts.append("    <meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-    html_parts.append("    <title>Презентація - Документ</title>")
-    html_parts.append("    <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css'>")
-    html_parts.append("    <style>")
-    html_parts.append("        body { position: relative; margin: 0; padding: 0; }")
-    html_parts.append("        .document-container { max-width: 900px; margin: 0 auto; padding: 2rem; text-align: left; }")
-    html_parts.append("        ")
-    html_parts.append("        .slide-block { margin-bottom: 3rem; padding: 2rem; border-left: 4px solid #0066cc; background: #f8f9fa; border-radius: 0.5rem; text-align: left; }")
-    html_parts.append("        ")
-    html_parts.append("        .slide-block { opacity: 0; transform: translateY(20px); transition: opacity 0.6s ease, transform 0.6s ease; display: none; }")
-    html_parts.append("        .slide-block.visible { opacity: 1; transform: translateY(0); display: block; }")
-    html_parts.append("        ")
-    html_parts.append("        .slide-block h1 { font-size: 2.5rem; margin-bottom: 1rem; color: #0066cc; text-align: left; }")
-    html_parts.append("        .slide-block h2 { font-size: 2rem; margin-bottom: 1rem; color: #0066cc; text-align: left; }")
-    html_parts.append("        .slide-block p, .slide-block div { text-align: left; }")
-    html_parts.append("        ")
-    html_parts.append("        .slide-block code { background: #e9ecef; padding: 0.2rem 0.4rem; border-radius: 0.25rem; }")
-    html_parts.append("        .slide-block pre { background: #e9ecef; padding: 1rem; border-radius: 0.5rem; overflow-x: auto; text-align: left; }")
-    html_parts.append("        .slide-block .definition { border: 2px solid #333; padding: 1rem; margin: 1rem 0; border-radius: 0.5rem; background: white; text-align: left; }")
-    html_parts.append("        .slide-block .task { background: #fff3cd; padding: 1rem; border-left: 4px solid #ffc107; margin: 1rem 0; text-align: left; }")
-    html_parts.append("        .slide-block .table-container { overflow-x: auto; margin: 1rem 0; }")
-    html_parts.append("        .slide-block table { width: 100%; border-collapse: collapse; }")
-    html_parts.append("        .slide-block table th, .slide-block table td { border: 1px solid #ddd; padding: 0.5rem; text-align: left; }")
-    html_parts.append("        .slide-block table th { background: #e9ecef; }")
-    html_parts.append("        .slide-block .italic { font-style: italic; }")
-    html_parts.append("        .slide-block img { max-width: 100%; height: auto; }")
-    html_parts.append("        ")
-    html_parts.append("        #drawingCanvas { position: fixed; top: 0; left: 0; width: 100%; height: 100%; z-index: 500; pointer-events: none; }")
-    html_parts.append("        #drawingCanvas.drawing { pointer-events: all; }")
-    html_parts.append("        .drawing-toggle-btn { position: fixed; top: 2rem; right: 2rem; z-index: 1001; width: 50px; height: 50px; border-radius: 50%; background: #0066cc; color: white; border: none; cursor: pointer; font-size: 24px; box-shadow: 0 2px 8px rgba(0,0,0,0.3); display: flex; align-items: center; justify-content: center; }")
-    html_parts.append("        .drawing-toggle-btn:hover { background: #0052a3; }")
-    html_parts.append("        .drawing-controls { position: fixed; top: 6rem; right: 2rem; z-index: 1001; background: white; padding: 1rem; border-radius: 0.5rem; box-shadow: 0 2px 8px rgba(0,0,0,0.2); display: none; }")
-    html_parts.append("        .drawing-controls.visible { display: block; }")
-    html_parts.append("        .drawing-controls button { margin: 0.25rem; display: block; width: 100%; }")
-    html_parts.append("        .color-picker { display: flex; gap: 0.5rem; margin: 0.5rem 0; flex-wrap: wrap; }")
-    html_parts.append("        .color-btn { width: 30px; height: 30px; border: 2px solid #333; border-radius: 50%; cursor: pointer; }")
-    html_parts.append("        .color-btn.active { border-color: #0066cc; border-width: 3px; }")
-    html_parts.append("        .eraser-btn { width: 30px; height: 30px; border: 2px solid #333; border-radius: 4px; cursor: pointer; background: white; display: flex; align-items: center; justify-content: center; font-size: 18px; }")
-    html_parts.append("        .eraser-btn.active { border-color: #0066cc; border-width: 3px; background: #f0f0f0; }")
-
-    # Додаткові стилі для викладацького формату
-    if doc_type == "html-tut":
-        html_parts.append("        /* Викладацький формат - розширені стилі */")
-        html_parts.append("        .slide-block { background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); border-left-color: #3f51b5; }")
-        html_parts.append("        .slide-block h1 { color: #1a237e; text-shadow: 2px 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide-block h2 { color: #283593; border-bottom: 2px solid #3f51b5; padding-bottom: 0.5rem; }")
-        html_parts.append("        .slide-block .definition { background: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1); border-left: 5px solid #3f51b5; }")
-        html_parts.append("        .slide-block .task { background: linear-gradient(135deg, #fff3cd 0%, #ffe082 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide-block code { background: #263238; color: #aed581; font-weight: bold; }")
-        html_parts.append("        .slide-block pre { background: #263238; color: #aed581; border: 2px solid #37474f; }")
-        html_parts.append("        .slide-block table { box-shadow: 0 2px 8px rgba(0,0,0,0.1); }")
-    html_parts.append("    </style>")
-    html_parts.append("</head>")
-    html_parts.append("<body>")
-    html_parts.append("    <canvas id='drawingCanvas'></canvas>")
-    html_parts.append("    <button class='drawing-toggle-btn' id='drawingToggleBtn' title='Малювання'>✏️</button>")
-    html_parts.append("    <div class='drawing-controls' id='drawingControls'>")
-    html_parts.append("        <button id='clearDrawing'>Очистити</button>")
-    html_parts.append("        <div class='color-picker'>")
-    html_parts.append("            <div class='color-btn active' data-color='#000000' style='background: #000000;' title='Чорний'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#ff0000' style='background: #ff0000;' title='Червоний'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#0000ff' style='background: #0000ff;' title='Синій'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#00ff00' style='background: #00ff00;' title='Зелений'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#ffff00' style='background: #ffff00;' title='Жовтий'></div>")
-    html_parts.append( "            <div class='color-btn' data-color='#ff00ff' style='background: #ff00ff;' title='Пурпурний'></div>")
-    html_parts.append("            <div class='color-btn' data-color='#ffffff' style='background: #ffffff;' title='Білий'></div>")
-    html_parts.append("            <div class='eraser-btn' id='eraserBtn' title='Ластик'>🧹</div>")
-    html_parts.append("        </div>")
-    html_parts.append("    </div>")
-    html_parts.append("    <div class='document-container'>")
+    return ''.join(iter_html_document(slides, language, doc_type, paginate_tables))
+
+
+def iter_html_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                       paginate_tables: bool = False) -> Iterator[str]:
+    """Потоковий варіант render_html_document"""
+    head, tail = _shell(_DOCUMENT_SHELLS, doc_type)
+    yield head
 
     # Генеруємо слайди як блоки
-    for i, slide in enumerate(slides):
-        html_parts.append(f"        <div class='slide-block' id='block-{i}'>")
-        html_parts.append(render_slide_content(slide))
-        html_parts.append("        </div>")
-
-    html_parts.append("    </div>")
-
-    # JS для показу блоків по кліку
-    html_parts.append("    <script>")
-    html_parts.append("        const blocks = document.querySelectorAll('.slide-block');")
-    html_parts.append("        let currentBlock = 0;")
-    html_parts.append("        ")
-    html_parts.append("        // Показуємо перший блок одразу")
-    html_parts.append("        if (blocks.length > 0) {")
-    html_parts.append("            blocks[0].classList.add('visible');")
-    html_parts.append("        }")
-    html_parts.append("        ")
-    html_parts.append("        function showNextBlock() {")
-    html_parts.append("            if (currentBlock < blocks.length - 1) {")
-    html_parts.append("                currentBlock++;")
-    html_parts.append("                blocks[currentBlock].classList.add('visible');")
-    html_parts.append("                // Прокручуємо до нового блоку")
-    html_parts.append("                setTimeout(() => {")
-    html_parts.append("                    blocks[currentBlock].scrollIntoView({ behavior: 'smooth', block: 'start' });")
-    html_parts.append("                }, 100);")
-    html_parts.append("            }")
-    html_parts.append("        }")
-    html_parts.append("        ")
-    html_parts.append("        // Обробка кліків - тільки на body/document, не на інтерактивних елементах")
-    html_parts.append("        document.body.addEventListener('click', (e) => {")
-    html_parts.append("            // Не показуємо наступний блок, якщо клікнули на посилання, кнопку, input, textarea, canvas")
-    html_parts.append("            const tag = e.target.tagName;")
-    html_parts.append( "            if (tag === 'A' || tag === 'BUTTON' || tag === 'INPUT' || tag === 'TEXTAREA' || tag === 'SELECT' || tag === 'CANVAS') return;")
-    html_parts.append("            // Перевіряємо, чи клікнули на батьківський елемент з посиланням, кнопкою або canvas")
-    html_parts.append("            if (e.target.closest('a') || e.target.closest('button') || e.target.closest('canvas')) return;")
-    html_parts.append("            showNextBlock();")
-    html_parts.append("        });")
-    html_parts.append("        ")
-    html_parts.append("        // Обробка клавіш")
-    html_parts.append("        document.addEventListener('keydown', (e) => {")
-    html_parts.append("            if (e.key === 'ArrowRight' || e.key === ' ' || e.key === 'Enter') {")
-    html_parts.append("                e.preventDefault();")
-    html_parts.append("                showNextBlock();")
-    html_parts.append("            }")
-    html_parts.append("        });")
-    html_parts.append("        ")
-    html_parts.append("        // Підказка для користувача")
-    html_parts.append("        if (blocks.length > 1) {")
-    html_parts.append("            const hint = document.createElement('div');")
-    html_parts.append("            hint.style.cssText = 'position: fixed; bottom: 2rem; right: 2rem; background: rgba(0,0,0,0.7); color: white; padding: 1rem; border-radius: 0.5rem; z-index: 1000; font-size: 0.9rem; pointer-events: none;';")
-    html_parts.append("            hint.textContent = 'Клікніть або натисніть → для наступного слайду';")
-    html_parts.append("            document.body.appendChild(hint);")
-    html_parts.append("            setTimeout(() => hint.remove(), 5000);")
-    html_parts.append("        }")
-    html_parts.append("        ")
-    html_parts.append("        // Малювання")
-    html_parts.append("        const canvas = document.getElementById('drawingCanvas');")
-    html_parts.append("        const ctx = canvas.getContext('2d');")
-    html_parts.append("        let isDrawing = false;")
-    html_parts.append("        let currentColor = '#000000';")
-    html_parts.append("")
-    html_parts.append("        function resizeCanvas() {")
-    html_parts.append("            canvas.width = window.innerWidth;")
-    html_parts.append("            canvas.height = window.innerHeight;")
-    html_parts.append("        }")
-    html_parts.append("        resizeCanvas();")
-    html_parts.append("        window.addEventListener('resize', resizeCanvas);")
-    html_parts.append("")
-    html_parts.append("        let isDrawingMode = false;")
-    html_parts.append("        let isEraser = false;")
-    html_parts.append("        ")
-    html_parts.append("        const drawingToggleBtn = document.getElementById('drawingToggleBtn');")
-    html_parts.append("        const drawingControls = document.getElementById('drawingControls');")
-    html_parts.append("        ")
-    html_parts.append("        drawingToggleBtn.addEventListener('click', function() {")
-    html_parts.append("            if (drawingControls.classList.contains('visible')) {")
-    html_parts.append("                drawingControls.classList.remove('visible');")
-    html_parts.append("                canvas.classList.remove('drawing');")
-    html_parts.append("                isDrawingMode = false;")
-    html_parts.append("            } else {")
-    html_parts.append("                drawingControls.classList.add('visible');")
-    html_parts.append("                canvas.classList.add('drawing');")
-    html_parts.append("                isDrawingMode = true;")
-    html_parts.append("            }")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        document.getElementById('clearDrawing').addEventListener('click', function() {")
-    html_parts.append("            ctx.clearRect(0, 0, canvas.width, canvas.height);")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        document.querySelectorAll('.color-btn').forEach(btn => {")
-    html_parts.append("            btn.addEventListener('click', function() {")
-    html_parts.append("                document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));")
-    html_parts.append("                if (document.getElementById('eraserBtn')) {")
-    html_parts.append("                    document.getElementById('eraserBtn').classList.remove('active');")
-    html_parts.append("                }")
-    html_parts.append("                this.classList.add('active');")
-    html_parts.append("                currentColor = this.getAttribute('data-color');")
-    html_parts.append("                isEraser = false;")
-    html_parts.append("            });")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        if (document.getElementById('eraserBtn')) {")
-    html_parts.append("            document.getElementById('eraserBtn').addEventListener('click', function() {")
-    html_parts.append("                document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));")
-    html_parts.append("                this.classList.toggle('active');")
-    html_parts.append("                isEraser = this.classList.contains('active');")
-    html_parts.append("            });")
-    html_parts.append("        }")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mousedown', function(e) {")
-    html_parts.append("            if (!isDrawingMode) return;")
-    html_parts.append("            e.stopPropagation();")
-    html_parts.append("            isDrawing = true;")
-    html_parts.append("            ctx.beginPath();")
-    html_parts.append("            ctx.moveTo(e.clientX, e.clientY);")
-    html_parts.append("            if (isEraser) {")
-    html_parts.append("                ctx.globalCompositeOperation = 'destination-out';")
-    html_parts.append("                ctx.lineWidth = 10;")
-    html_parts.append("            } else {")
-    html_parts.append("                ctx.globalCompositeOperation = 'source-over';")
-    html_parts.append("                ctx.strokeStyle = currentColor;")
-    html_parts.append("                ctx.lineWidth = 3;")
-    html_parts.append("            }")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mousemove', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.stopPropagation();")
-    html_parts.append("            ctx.lineTo(e.clientX, e.clientY);")
-    html_parts.append("            ctx.lineCap = 'round';")
-    html_parts.append("            ctx.stroke();")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mouseup', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('mouseleave', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        // Touch events for mobile")
-    html_parts.append("        canvas.addEventListener('touchstart', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.preventDefault();")
-    html_parts.append("            const touch = e.touches[0];")
-    html_parts.append("            ctx.beginPath();")
-    html_parts.append("            ctx.moveTo(touch.clientX, touch.clientY);")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('touchmove', function(e) {")
-    html_parts.append("            if (!isDrawing) return;")
-    html_parts.append("            e.preventDefault();")
-    html_parts.append("            const touch = e.touches[0];")
-    html_parts.append("            ctx.lineTo(touch.clientX, touch.clientY);")
-    html_parts.append("            ctx.strokeStyle = currentColor;")
-    html_parts.append("            ctx.lineWidth = 3;")
-    html_parts.append("            ctx.lineCap = 'round';")
-    html_parts.append("            ctx.stroke();")
-    html_parts.append("        });")
-    html_parts.append("")
-    html_parts.append("        canvas.addEventListener('touchend', function() {")
-    html_parts.append("            isDrawing = false;")
-    html_parts.append("        });")
-    html_parts.append("    </script>")
-    html_parts.append("</body>")
-    html_parts.append("</html>")
+    yield from _iter_slide_chunks(slides, lambda i, slide: (
+        f"\n        <div class='slide-block' id='block-{i}'>\n{render_slide_content(slide, language, paginate_tables)}\n        </div>"
+    ))
 
-    return '\n'.join(html_parts)
+    yield '\n' + tail
 
 
-def render_html_full_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu") -> str:
+def render_html_full_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                              paginate_tables: bool = False) -> str:
     """
     Генерує HTML документ зі слайдів (всі слайди відображені одразу один за одним).
     """
-    html_parts = []
-    html_parts.append("<!DOCTYPE html>")
-    html_parts.append("<html lang='uk'>")
-    html_parts.append("<head>")
-    html_parts.append("    <meta charset='UTF-8'>")
-    html_parts.append("    <meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-    html_parts.append("    <title>Документ</title>")
-    html_parts.append("    <link rel='stylesheet' href='https://cdn.jsdelivr.net/npm/@picocss/pico@2/css/pico.min.css'>")
-    html_parts.append("    <style>")
-    html_parts.append("        .document-container { max-width: 900px; margin: 0 auto; padding: 2rem; }")
-    html_parts.append("        .slide-block { margin-bottom: 3rem; padding: 2rem; border-left: 4px solid #0066cc; background: #f8f9fa; border-radius: 0.5rem; }")
-    html_parts.append("        .slide-block h1 { font-size: 2.5rem; margin-bottom: 1rem; color: #0066cc; }")
-    html_parts.append("        .slide-block h2 { font-size: 2rem; margin-bottom: 1rem; color: #0066cc; }")
-    html_parts.append("        .slide-block code { background: #e9ecef; padding: 0.2rem 0.4rem; border-radius: 0.25rem; }")
-    html_parts.append("        .slide-block pre { background: #e9ecef; padding: 1rem; border-radius: 0.5rem; overflow-x: auto; }")
-    html_parts.append("        .slide-block .definition { border: 2px solid #333; padding: 1rem; margin: 1rem 0; border-radius: 0.5rem; background: white; }")
-    html_parts.append("        .slide-block .task { background: #fff3cd; padding: 1rem; border-left: 4px solid #ffc107; margin: 1rem 0; }")
-    html_parts.append("        .slide-block .table-container { overflow-x: auto; margin: 1rem 0; }")
-    html_parts.append("        .slide-block table { width: 100%; border-collapse: collapse; }")
-    html_parts.append("        .slide-block table th, .slide-block table td { border: 1px solid #ddd; padding: 0.5rem; }")
-    html_parts.append("        .slide-block table th { background: #e9ecef; }")
-    html_parts.append("        .slide-block .italic { font-style: italic; }")
-    html_parts.append("        .slide-block img { max-width: 100%; height: auto; }")
-
-    # Додаткові стилі для викладацького формату
-    if doc_type == "html-tut":
-        html_parts.append("        /* Викладацький формат - розширені стилі */")
-        html_parts.append("        .slide-block { background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); border-left-color: #3f51b5; }")
-        html_parts.append("        .slide-block h1 { color: #1a237e; text-shadow: 2px 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide-block h2 { color: #283593; border-bottom: 2px solid #3f51b5; padding-bottom: 0.5rem; }")
-        html_parts.append("        .slide-block .definition { background: white; box-shadow: 0 4px 6px rgba(0,0,0,0.1); border-left: 5px solid #3f51b5; }")
-        html_parts.append("        .slide-block .task { background: linear-gradient(135deg, #fff3cd 0%, #ffe082 100%); box-shadow: 0 2px 4px rgba(0,0,0,0.1); }")
-        html_parts.append("        .slide-block code { background: #263238; color: #aed581; font-weight: bold; }")
-        html_parts.append("        .slide-block pre { background: #263238; color: #aed581; border: 2px solid #37474f; }")
-        html_parts.append("        .slide-block table { box-shadow: 0 2px 8px rgba(0,0,0,0.1); }")
-
-    html_parts.append("    </style>")
-    html_parts.append("</head>")
-    html_parts.append("<body>")
-    html_parts.append("    <div class='document-container'>")
+    return ''.join(iter_html_full_document(slides, language, doc_type, paginate_tables))
 
-    # Генеруємо всі слайди одразу
-    for i, slide in enumerate(slides):
-        html_parts.append(f"        <div class='slide-block' id='block-{i}'>")
-        html_parts.append(render_slide_content(slide))
-        html_parts.append("        </div>")
 
-    html_parts.append("    </div>")
-    html_parts.append("</body>")
-    html_parts.append("</html>")
+def iter_html_full_document(slides: List[Slide], language: str = "python", doc_type: str = "html-stu",
+                            paginate_tables: bool = False) -> Iterator[str]:
+    """Потоковий варіант render_html_full_document"""
+    head, tail = _shell(_FULL_DOCUMENT_SHELLS, doc_type)
+    yield head
 
-    return '\n'.join(html_parts)
+    # Генеруємо всі слайди одразу
+    yield from _iter_slide_chunks(slides, lambda i, slide: (
+        f"\n        <div class='slide-block' id='block-{i}'>\n{render_slide_content(slide, language, paginate_tables)}\n        </div>"
+    ))
+
+    yield '\n' + tail
 
 
 def render_markdown(slides: List[Slide]) -> str:
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse
+from ..assets import choose_variant, find_asset
+
+router = APIRouter()
+
+# Адреса ресурсу містить відбиток вмісту, тому відповідь не змінюється ніколи
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{filename}")
+async def get_asset(request: Request, filename: str):
+    """Стилі та скрипти презентацій (з попередньо стиснутими варіантами)"""
+    asset = find_asset(filename)
+    if not asset:
+        raise HTTPException(status_code=404, detail="Файл не знайдено")
+
+    path, encoding = choose_variant(asset, request.headers.get("accept-encoding", ""))
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type=asset.media_type, headers=headers)
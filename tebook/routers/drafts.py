@@ -1,26 +1,81 @@
 from fastapi import APIRouter, HTTPException, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from typing import List, Annotated
-from ..dal import create_draft, get_draft, get_all_drafts, update_draft, delete_draft, duplicate_draft
+from markupsafe import Markup, escape
+from typing import List, Annotated, Optional
+from ..dal import DRAFT_LIST_ORDERS, SEARCH_MATCH_END, SEARCH_MATCH_START
+from ..dal_async import (create_draft, get_draft, list_drafts_page, search_drafts, update_draft, delete_draft,
+                         duplicate_draft)
 from ..models import DraftCreate, DraftUpdate, User
 from ..parser import parse_draft
 from ..renderer import render_html
 from ..routers.login_router import get_current_user, get_current_user_optional, get_current_teacher
+from ..templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="tebook/templates")
+
+# Максимальна довжина пошукового запиту
+SEARCH_QUERY_MAX_LENGTH = 200
 
 
 @router.get("/", response_class=HTMLResponse)
 async def list_drafts(request: Request, 
-                     user: Annotated[User | None, Depends(get_current_user_optional)]):
-    """Список всіх чернеток (доступний всім)"""
-    drafts = get_all_drafts()
+                     user: Annotated[User | None, Depends(get_current_user_optional)],
+                     order: str = "updated",
+                     after: Optional[str] = None):
+    """
+    Список чернеток (доступний всім), посторінково
+
+    Args:
+        order: "updated" (нещодавно змінені) або "created" (нещодавно створені)
+        after: Ключ останньої чернетки попередньої сторінки ("значення|id")
+    """
+    if order not in DRAFT_LIST_ORDERS:
+        raise HTTPException(status_code=400, detail="Невірний порядок сортування")
+    key = None
+    if after:
+        value, _, draft_id = after.rpartition("|")
+        if not value or not draft_id.isdigit():
+            raise HTTPException(status_code=400, detail="Невірний ключ сторінки")
+        key = (value, int(draft_id))
+
+    drafts, next_key = await list_drafts_page(order, key)
     is_teacher = user and user.role in ["teacher", "admin"] if user else False
     return templates.TemplateResponse("drafts_list.html", {
         "request": request,
         "drafts": drafts,
+        "order": order,
+        "next_after": f"{next_key[0]}|{next_key[1]}" if next_key else None,
+        "is_first_page": key is None,
+        "user": user,
+        "is_teacher": is_teacher
+    })
+
+
+def _snippet_html(snippet: str) -> Markup:
+    """Екранує фрагмент тексту і виділяє в ньому знайдені слова"""
+    return Markup(str(escape(snippet))
+                  .replace(SEARCH_MATCH_START, "<mark>")
+                  .replace(SEARCH_MATCH_END, "</mark>"))
+
+
+@router.get("/search", response_class=HTMLResponse)
+async def search_drafts_page(request: Request,
+                             user: Annotated[User | None, Depends(get_current_user_optional)],
+                             q: str = ""):
+    """Повнотекстовий пошук чернеток за назвою і текстом слайдів (доступний всім)"""
+    q = q.strip()
+    if len(q) > SEARCH_QUERY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail="Занадто довгий пошуковий запит")
+
+    results = [
+        {**row._asdict(), "snippet": _snippet_html(row.snippet)}
+        for row in (await search_drafts(q) if q else [])
+    ]
+    is_teacher = user and user.role in ["teacher", "admin"] if user else False
+    return templates.TemplateResponse("drafts_search.html", {
+        "request": request,
+        "query": q,
+        "results": results,
         "user": user,
         "is_teacher": is_teacher
     })
@@ -42,7 +97,7 @@ async def new_draft_form(request: Request,
 async def view_draft(request: Request, draft_id: int,
                     user: Annotated[User | None, Depends(get_current_user_optional)]):
     """Перегляд чернетки (доступний всім)"""
-    draft = get_draft(draft_id)
+    draft = await get_draft(draft_id, with_content=True)
     if not draft:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     
@@ -59,7 +114,7 @@ async def view_draft(request: Request, draft_id: int,
 async def edit_draft_form(request: Request, draft_id: int,
                          user: Annotated[User, Depends(get_current_teacher)]):
     """Форма редагування чернетки (тільки для викладачів)"""
-    draft = get_draft(draft_id)
+    draft = await get_draft(draft_id, with_content=True)
     if not draft:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     
@@ -105,7 +160,7 @@ async def create_draft_post(request: Request,
             else:
                 draft_title = title
             
-            draft = create_draft(draft_title, content, language, doc_type, view_modes_str)
+            draft = await create_draft(draft_title, content, language, doc_type, view_modes_str)
             created_drafts.append(draft)
     
     if not created_drafts:
@@ -119,7 +174,7 @@ async def duplicate_draft_post(draft_id: int,
                               user: Annotated[User, Depends(get_current_teacher)],
                               new_doc_type: str = Form(...)):
     """Дублює чернетку, можливо змінюючи тип документа (тільки для викладачів)"""
-    original = get_draft(draft_id)
+    original = await get_draft(draft_id)
     if not original:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
 
@@ -130,7 +185,7 @@ async def duplicate_draft_post(draft_id: int,
     if new_doc_type not in valid_formats:
         raise HTTPException(status_code=400, detail="Невірний формат документа")
     
-    new_draft = duplicate_draft(draft_id, new_doc_type)
+    new_draft = await duplicate_draft(draft_id, new_doc_type)
     if not new_draft:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     return RedirectResponse(url=f"/drafts/{new_draft.id}", status_code=303)
@@ -140,7 +195,7 @@ async def duplicate_draft_post(draft_id: int,
 async def delete_draft_post(draft_id: int,
                            user: Annotated[User, Depends(get_current_teacher)]):
     """Видаляє чернетку (тільки для викладачів)"""
-    if not delete_draft(draft_id):
+    if not await delete_draft(draft_id):
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     return RedirectResponse(url="/drafts/", status_code=303)
 
@@ -152,7 +207,7 @@ async def update_draft_post(request: Request, draft_id: int,
                            content: str = Form(...),
                            language: str = Form("python")):
     """Оновлює чернетку (тільки для викладачів)"""
-    original = get_draft(draft_id)
+    original = await get_draft(draft_id)
     if not original:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
 
@@ -170,21 +225,21 @@ async def update_draft_post(request: Request, draft_id: int,
     current_format = original.doc_type
 
     if current_format in doc_types:
-        draft = update_draft(draft_id, title, content, language, None, view_modes_str)
+        draft = await update_draft(draft_id, title, content, language, None, view_modes_str)
         if not draft:
             raise HTTPException(status_code=404, detail="Чернетку не знайдено")
 
         for doc_type in doc_types:
             if doc_type in valid_formats and doc_type != current_format:
-                duplicate_draft(draft_id, doc_type)
+                await duplicate_draft(draft_id, doc_type)
     else:
         new_format = doc_types[0] if doc_types else current_format
-        draft = update_draft(draft_id, title, content, language, new_format, view_modes_str)
+        draft = await update_draft(draft_id, title, content, language, new_format, view_modes_str)
         if not draft:
             raise HTTPException(status_code=404, detail="Чернетку не знайдено")
 
         for doc_type in doc_types[1:]:
             if doc_type in valid_formats:
-                duplicate_draft(draft_id, doc_type)
+                await duplicate_draft(draft_id, doc_type)
     
     return RedirectResponse(url=f"/drafts/{draft.id}", status_code=303)
\ No newline at end of file
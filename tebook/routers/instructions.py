@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from typing import Annotated
 from fastapi import Depends
 from ..models import User
 from ..routers.login_router import get_current_user_optional
+from ..templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="tebook/templates")
 
 
 @router.get("/", response_class=HTMLResponse)
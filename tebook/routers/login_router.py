@@ -1,43 +1,141 @@
 from fastapi.security import APIKeyCookie, OAuth2PasswordRequestForm
 from fastapi import APIRouter, Depends, HTTPException, Request, Security, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
-from datetime import datetime, timedelta
-from typing import Annotated
-import bcrypt
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Annotated, Optional, Tuple
+import time
+import anyio.to_thread
 import jwt
+from anyio import CapacityLimiter
+from ..cache import token_cache
+from ..dal_async import get_user, set_password_hash
 from ..models import User
+from ..passwords import check_password
+from ..settings import settings
+from ..templating import templates
 
 SECRET_KEY = "super-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# За скільки хвилин до закінчення токена активному користувачу видається новий
+TOKEN_RENEW_BEFORE_MINUTES = 10
+# Потоки для перевірки паролів (bcrypt навантажує процесор, тому їх небагато)
+LOGIN_THREADS = settings.login_threads
+# Одночасні перевірки пароля для одного логіна
+LOGIN_CONCURRENCY_PER_USER = settings.login_concurrency_per_user
 
 router = APIRouter()
-templates = Jinja2Templates(directory="tebook/templates")
 cookie_scheme = APIKeyCookie(name="access_token")
 
+_limiter: Optional[CapacityLimiter] = None
+# Кількість спроб входу, що перевіряються зараз, за логіном
+_pending_logins: Counter = Counter()
 
-def get_authenticated_user(username: str, password: str) -> User | None:
+
+def _get_limiter() -> CapacityLimiter:
+    # Створюється при першому використанні, всередині циклу подій
+    global _limiter
+    if _limiter is None:
+        _limiter = CapacityLimiter(LOGIN_THREADS)
+    return _limiter
+
+
+async def run_password_check(password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """Перевіряє пароль (bcrypt) в окремому обмеженому пулі потоків, не блокуючи цикл подій"""
+    return await anyio.to_thread.run_sync(partial(check_password, password, hashed), limiter=_get_limiter())
+
+
+async def get_authenticated_user(username: str, password: str) -> User | None:
     """
     Повертає перевіреного юзера або None
+
+    Пароль перевіряється за хешем bcrypt з таблиці users. Одночасно
+    перевіряється не більше LOGIN_CONCURRENCY_PER_USER спроб для одного
+    логіна: решта відхиляються одразу (429) і не займають пул потоків.
+    Хеш, створений з іншою вартістю bcrypt, ніж у налаштуваннях,
+    перераховується після успішного входу.
     """
-    # Тимчасово: задані користувачі для тестування
-    # Пізніше тут буде перевірка з БД
-    users = {
-        "admin": ("123456", "admin"),
-        "teacher": ("123456", "teacher"),
-        "student": ("123456", "student")
+    if _pending_logins[username] >= LOGIN_CONCURRENCY_PER_USER:
+        raise HTTPException(status_code=429, detail="Забагато одночасних спроб входу")
+    _pending_logins[username] += 1
+    try:
+        user = await get_user(username)
+        valid, new_hash = await run_password_check(password, user.hashed_password if user else None)
+    finally:
+        _pending_logins[username] -= 1
+        if not _pending_logins[username]:
+            del _pending_logins[username]
+
+    if user is None or not valid:
+        return None
+    if new_hash is not None:
+        await set_password_hash(username, new_hash)
+    return user
+
+
+def create_access_token(username: str, role: str) -> str:
+    """Підписаний токен доступу, дійсний ACCESS_TOKEN_EXPIRE_MINUTES хвилин"""
+    claims = {
+        "sub": username,
+        "role": role,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     }
-    
-    if username in users:
-        stored_password, role = users[username]
-        if password == stored_password:
-            return User(
-                username=username,
-                hashed_password=bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()),
-                role=role
-            )
-    return None
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def set_token_cookie(response: Response, token: str):
+    """Записує токен доступу в кукі відповіді"""
+    response.set_cookie(
+        key="access_token",
+        value=token,
+        httponly=True,
+        samesite="lax",
+        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    )
+
+
+def verify_token(token: str) -> dict | None:
+    """
+    Повертає дані перевіреного токена (sub, role, exp) або None.
+
+    Підпис перевіряється один раз: перевірені токени тримаються в кеші і
+    далі приймаються без jwt.decode, доки не настане їхній exp.
+    """
+    payload = token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        token_cache.discard(token)
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    if not isinstance(payload.get("exp"), (int, float)):
+        return None
+    token_cache.set(token, payload)
+    return payload
+
+
+def _user_from_token(request: Request, token: str) -> User | None:
+    """
+    Користувач з токена доступу.
+
+    Якщо до закінчення токена лишилося менше TOKEN_RENEW_BEFORE_MINUTES,
+    видається новий токен: він зберігається в request.state.renewed_token,
+    а TokenRenewalMiddleware записує його в кукі відповіді. Так сесія
+    не обривається посеред заняття, поки користувач активний.
+    """
+    payload = verify_token(token)
+    if payload is None:
+        return None
+    if payload["exp"] - time.time() < TOKEN_RENEW_BEFORE_MINUTES * 60:
+        request.state.renewed_token = create_access_token(payload.get("sub"), payload.get("role"))
+    return User(username=payload.get("sub"), role=payload.get("role"))
 
 
 def get_current_user_optional(request: Request) -> User | None:
@@ -45,22 +143,46 @@ def get_current_user_optional(request: Request) -> User | None:
     token = request.cookies.get("access_token")
     if not token:
         return None
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return User(username=payload.get("sub"), role=payload.get("role"))
-    except Exception:
-        return None
+    return _user_from_token(request, token)
 
 
-def get_current_user(token: Annotated[str, Security(cookie_scheme)] = None) -> User:
+def get_current_user(request: Request, token: Annotated[str, Security(cookie_scheme)] = None) -> User:
     """Отримує поточного користувача з токена (обов'язково)"""
     if not token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return User(username=payload.get("sub"), role=payload.get("role"))
-    except Exception:
+    user = _user_from_token(request, token)
+    if user is None:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return user
+
+
+class TokenRenewalMiddleware:
+    """
+    ASGI-middleware: записує в кукі відповіді новий токен, якщо його видала
+    залежність автентифікації (request.state.renewed_token).
+
+    Працює напряму з ASGI-повідомленнями, без BaseHTTPMiddleware, щоб не
+    додавати помітних витрат кожному запиту.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # Той самий словник, що й request.state у обробниках
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start" and state.get("renewed_token") is not None:
+                cookie = Response()
+                set_token_cookie(cookie, state["renewed_token"])
+                MutableHeaders(scope=message).append("set-cookie", cookie.headers["set-cookie"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
 
 
 def get_current_teacher(user: Annotated[User, Depends(get_current_user)]) -> User:
@@ -73,40 +195,30 @@ def get_current_teacher(user: Annotated[User, Depends(get_current_user)]) -> Use
 @router.get("", response_class=HTMLResponse)
 async def get_login(request: Request):
     """Форма входу"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return templates.TemplateResponse("login.html", {
+        "request": request,
+        "test_users": settings.create_test_users,
+    })
 
 
 @router.post("")
 async def post_login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Обробка входу та видача токена"""
-    user = get_authenticated_user(form_data.username, form_data.password)
+    user = await get_authenticated_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Створення токену
-    expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    claims = {
-        "sub": user.username,
-        "role": user.role,
-        "exp": datetime.utcnow() + expires_delta
-    }
-    access_token = jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
-    
-    # Встановлення кукі
     response = RedirectResponse("/drafts/", status_code=302)
-    response.set_cookie(
-        key="access_token",
-        value=access_token,
-        httponly=True,
-        samesite="lax",
-        max_age=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-    )
+    set_token_cookie(response, create_access_token(user.username, user.role))
     return response
 
 
 @router.post("/logout")
-async def logout():
+async def logout(request: Request):
     """Вихід з системи"""
+    token = request.cookies.get("access_token")
+    if token:
+        token_cache.discard(token)
     response = RedirectResponse("/login", status_code=302)
     response.delete_cookie(key="access_token")
     return response
\ No newline at end of file
@@ -1,16 +1,175 @@
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from ..dal import get_draft
-from ..parser import parse_draft
-from ..renderer import render_html, render_markdown
+import anyio.to_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
+from typing import Annotated, Iterator, List, Optional
+from ..cache import RenderedPage, etag_matches, make_etag, render_cache
+from ..dal import get_draft as load_draft, get_draft_slides as load_draft_slides
+from ..dal_async import get_draft, get_draft_ids, get_draft_slides
+from ..export import ExportEntry, iter_zip
+from ..metrics import set_view_mode, stage
+from ..models import Draft, User
+from ..images import image_index
+from ..prebuild import draft_pages, draft_view_modes
+from ..profiling import ProfilerBusy, profile_render
+from ..renderer import image_versions, iter_html, render_html, render_slide_fragments, render_table_page, table_hash
+from ..routers.login_router import get_current_teacher, get_current_user_optional
+from ..slide import Slide
 
 router = APIRouter()
-templates = Jinja2Templates(directory="tebook/templates")
+
+# Презентації з такою кількістю слайдів і більше віддаються потоком
+STREAM_MIN_SLIDES = 500
+# У режимі слайдів презентації, довші за цю кількість слайдів,
+# підвантажують слайди з сервера за потреби
+LAZY_SLIDES_THRESHOLD = 30
+# Максимальна кількість слайдів в одному запиті відкладеного завантаження
+MAX_FRAGMENT_SLIDES = 20
+# Режими відображення HTML (невідомі значення з запиту рендеряться як слайди)
+VIEW_MODES = ("slides", "document", "full-document")
+
+
+def normalize_view_mode(view_mode: str) -> str:
+    """
+    Режим відображення з параметра запиту. Значення входить у ключ кешу
+    сторінок, тому довільні рядки зводяться до "slides" і не витісняють з
+    кешу справжні сторінки.
+    """
+    return view_mode if view_mode in VIEW_MODES else "slides"
+
+
+def cache_key(draft: Draft, doc_type: str, view_mode: str, lazy: bool = False) -> tuple:
+    return (draft.id, draft.updated_at, doc_type, view_mode, lazy)
+
+
+def cached_page(draft: Draft, doc_type: str, view_mode: str, lazy: bool = False) -> Optional[RenderedPage]:
+    """Сторінка з кешу, якщо зображення, на які вона посилається, не змінилися"""
+    page = render_cache.get(cache_key(draft, doc_type, view_mode, lazy))
+    if page is not None and image_index.is_current(page.images):
+        return page
+    return None
+
+
+def lazy_slides_url(draft: Draft, slides: List[Slide], doc_type: str, view_mode: str) -> Optional[str]:
+    """Адреса для відкладеного завантаження слайдів або None, якщо сторінка містить усі слайди"""
+    if doc_type == "md" or view_mode in ("document", "full-document"):
+        return None
+    if len(slides) <= LAZY_SLIDES_THRESHOLD:
+        return None
+    return f"/presentations/{draft.id}/slides/"
+
+
+def render_page(draft: Draft, slides: List[Slide], doc_type: str, view_mode: str, lazy: bool = False) -> RenderedPage:
+    """
+    Рендерить презентацію і зберігає результат у кеші.
+
+    Якщо lazy (сторінка для перегляду на сайті, а не експорт), довгі
+    презентації в режимі слайдів рендеряться з відкладеним завантаженням
+    слайдів, а великі таблиці - з відкладеним завантаженням рядків.
+    """
+    lazy_url = lazy_slides_url(draft, slides, doc_type, view_mode) if lazy else None
+    with stage("render"):
+        images = image_versions(slides)
+        body = render_html(slides, draft.language, doc_type, view_mode, lazy_url, paginate_tables=lazy)
+    page = RenderedPage(body=body, etag=make_etag(body), images=images)
+    render_cache.set(cache_key(draft, doc_type, view_mode, lazy), page)
+    return page
+
+
+async def draft_slides(draft: Draft) -> List[Slide]:
+    """Слайди чернетки; 404, якщо її видалили після читання draft"""
+    slides = await get_draft_slides(draft)
+    if slides is None:
+        raise HTTPException(status_code=404, detail="Чернетку не знайдено")
+    return slides
+
+
+async def render_cached(draft: Draft, doc_type: str, view_mode: str) -> RenderedPage:
+    """Рендерить презентацію або бере готовий результат з кешу"""
+    page = cached_page(draft, doc_type, view_mode)
+    if page is None:
+        page = render_page(draft, await draft_slides(draft), doc_type, view_mode)
+    return page
+
+
+def not_modified(request: Request, page: RenderedPage) -> bool:
+    """Чи має клієнт актуальну копію сторінки"""
+    return etag_matches(request.headers.get("if-none-match"), page.etag)
+
+
+def export_entries(draft_ids: List[int], format: str, view_mode: Optional[str]) -> Iterator[ExportEntry]:
+    """
+    Файли архіву для масового експорту.
+
+    Генератор виконується в потоці StreamingResponse (поза циклом подій),
+    тому чернетки читаються синхронно. Кожна чернетка завантажується лише
+    тоді, коли до неї доходить черга, тож у пам'яті немає вмісту всіх
+    чернеток архіву одночасно.
+    """
+    for draft_id in draft_ids:
+        draft = load_draft(draft_id)
+        if draft is None:
+            # Видалена після початку експорту
+            continue
+        slides = load_draft_slides(draft)
+        if slides is None:
+            continue
+        if format == "md" or draft.doc_type == "md":
+            yield f"presentation_{draft.id}.md", slides, draft.language, "md", "slides"
+            continue
+        view_modes = [view_mode] if view_mode else draft_view_modes(draft)
+        for mode, filename in draft_pages(draft.doc_type, view_modes):
+            yield f"presentation_{draft.id}/{filename}", slides, draft.language, draft.doc_type, mode
+
+
+@router.get("/bulk-export")
+async def bulk_export(user: Annotated[User, Depends(get_current_teacher)],
+                      ids: Annotated[Optional[List[int]], Query()] = None,
+                      doc_type: Optional[str] = None,
+                      language: Optional[str] = None,
+                      format: str = "html",
+                      view_mode: Optional[str] = None):
+    """
+    Масовий експорт презентацій у ZIP-архів
+
+    Args:
+        ids: ID чернеток (якщо не задано - усі чернетки, що відповідають фільтру)
+        doc_type: Фільтр за типом документа
+        language: Фільтр за мовою програмування
+        format: "html" або "md"
+        view_mode: Режим відображення для HTML (за замовчуванням - усі обрані
+            в чернетці режими)
+    """
+    if view_mode:
+        view_mode = normalize_view_mode(view_mode)
+    draft_ids = await get_draft_ids(ids, doc_type, language)
+    if not draft_ids:
+        raise HTTPException(status_code=404, detail="Чернетки не знайдено")
+
+    headers = {"Content-Disposition": 'attachment; filename="presentations.zip"'}
+    return StreamingResponse(iter_zip(export_entries(draft_ids, format, view_mode)),
+                             media_type="application/zip", headers=headers)
+
+
+async def profile_presentation(draft_id: int, view_mode: str) -> Response:
+    """Звіт профілювальника про рендеринг презентації замість самої презентації"""
+    def render(draft: Draft, slides: List[Slide]) -> str:
+        # Так само, як сторінка для перегляду в view_presentation
+        lazy_url = lazy_slides_url(draft, slides, draft.doc_type, view_mode)
+        return render_html(slides, draft.language, draft.doc_type, view_mode, lazy_url, paginate_tables=True)
+
+    try:
+        report = await anyio.to_thread.run_sync(profile_render, draft_id, view_mode, render)
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="Інше профілювання ще виконується")
+    if report is None:
+        raise HTTPException(status_code=404, detail="Чернетку не знайдено")
+    return PlainTextResponse(report, headers={"Cache-Control": "no-store"})
 
 
 @router.get("/{draft_id}")
-async def view_presentation(draft_id: int, view_mode: str = "slides"):
+async def view_presentation(request: Request, draft_id: int,
+                            user: Annotated[User | None, Depends(get_current_user_optional)],
+                            view_mode: str = "slides", profile: bool = False):
     """
     Перегляд презентації
     
@@ -20,35 +179,113 @@ async def view_presentation(draft_id: int, view_mode: str = "slides"):
             - "slides" (слайди з навігацією)
             - "document" (документ з блоків, з'являються по кліку)
             - "full-document" (повний документ, всі слайди відразу)
+        profile: Замість презентації повернути звіт профілювальника про її
+            рендеринг (тільки для викладачів)
     """
-    draft = get_draft(draft_id)
+    view_mode = normalize_view_mode(view_mode)
+    set_view_mode(view_mode)
+    if profile:
+        if user is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        get_current_teacher(user)
+        return await profile_presentation(draft_id, view_mode)
+
+    draft = await get_draft(draft_id)
     if not draft:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     
-    slides = parse_draft(draft.content)
-    
-    if draft.doc_type == "md":
-        content = render_markdown(slides)
-        return HTMLResponse(content=content)
-    else:
-        content = render_html(slides, draft.language, draft.doc_type, view_mode)
-        return HTMLResponse(content=content)
+    page = cached_page(draft, draft.doc_type, view_mode, lazy=True)
+    if page is None:
+        slides = await draft_slides(draft)
+        lazy_url = lazy_slides_url(draft, slides, draft.doc_type, view_mode)
+        if lazy_url is None and len(slides) >= STREAM_MIN_SLIDES:
+            # Великі презентації не збираються в пам'яті цілком і не кешуються:
+            # браузер отримує заголовок одразу, а слайди - в міру рендерингу
+            chunks = iter_html(slides, draft.language, draft.doc_type, view_mode, paginate_tables=True)
+            return StreamingResponse(chunks, media_type="text/html", headers={"Cache-Control": "no-cache"})
+        page = render_page(draft, slides, draft.doc_type, view_mode, lazy=True)
+
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if not_modified(request, page):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.body, headers=headers)
+
+
+@router.get("/{draft_id}/slides/{start}")
+async def get_slide_fragments(request: Request, draft_id: int, start: int, count: int = 1):
+    """
+    Відрендерені слайди для відкладеного завантаження в режимі слайдів
+
+    Args:
+        draft_id: ID чернетки
+        start: Номер першого слайду (з нуля)
+        count: Кількість слайдів (не більше MAX_FRAGMENT_SLIDES)
+    """
+    draft = await get_draft(draft_id)
+    if not draft:
+        raise HTTPException(status_code=404, detail="Чернетку не знайдено")
+
+    slides = await draft_slides(draft)
+    if start < 0 or start >= len(slides):
+        raise HTTPException(status_code=404, detail="Слайд не знайдено")
+
+    with stage("render"):
+        body = render_slide_fragments(slides, start, max(1, min(count, MAX_FRAGMENT_SLIDES)), draft.language)
+    headers = {"ETag": make_etag(body), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
+
+
+@router.get("/{draft_id}/tables/{table_id}")
+async def get_table_page(request: Request, draft_id: int, table_id: str, page: int = 1):
+    """
+    Сторінка рядків великої таблиці (@7) для підвантаження на клієнті
+
+    Args:
+        draft_id: ID чернетки
+        table_id: Ідентифікатор таблиці (хеш її вмісту)
+        page: Номер сторінки (0 - рядки, які вже є на сторінці презентації)
+    """
+    draft = await get_draft(draft_id)
+    if not draft:
+        raise HTTPException(status_code=404, detail="Чернетку не знайдено")
+
+    slides = await draft_slides(draft)
+    table = next((slide.content.strip() for slide in slides
+                  if slide.slide_type == "@7" and table_hash(slide.content.strip()) == table_id), None)
+    if table is None or page < 0:
+        raise HTTPException(status_code=404, detail="Таблицю не знайдено")
+
+    with stage("render"):
+        body = render_table_page(table, page)
+    headers = {"ETag": make_etag(body), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
 
 
 @router.get("/{draft_id}/export")
-async def export_presentation(draft_id: int, format: str = "html"):
+async def export_presentation(request: Request, draft_id: int, format: str = "html", view_mode: str = "slides"):
     """Експорт презентації у різних форматах"""
-    draft = get_draft(draft_id)
+    view_mode = normalize_view_mode(view_mode)
+    set_view_mode(view_mode)
+    draft = await get_draft(draft_id)
     if not draft:
         raise HTTPException(status_code=404, detail="Чернетку не знайдено")
     
-    slides = parse_draft(draft.content)
-    
     if format == "md" or draft.doc_type == "md":
-        content = render_markdown(slides)
-        from fastapi.responses import Response
-        return Response(content=content, media_type="text/markdown",
-                      headers={"Content-Disposition": f'attachment; filename="presentation_{draft_id}.md"'})
+        page = await render_cached(draft, "md", "slides")
+        headers = {
+            "ETag": page.etag,
+            "Content-Disposition": f'attachment; filename="presentation_{draft_id}.md"'
+        }
+        if not_modified(request, page):
+            return Response(status_code=304, headers=headers)
+        return Response(content=page.body, media_type="text/markdown", headers=headers)
     else:
-        content = render_html(slides, draft.language, draft.doc_type)
-        return HTMLResponse(content=content)
\ No newline at end of file
+        page = await render_cached(draft, draft.doc_type, view_mode)
+        headers = {"ETag": page.etag}
+        if not_modified(request, page):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=page.body, headers=headers)
@@ -0,0 +1,52 @@
+"""
+Налаштування застосунку.
+
+Значення за замовчуванням можна перевизначити змінними середовища з
+префіксом TEBOOK_ або у файлі .env, наприклад:
+
+    TEBOOK_DB_PROFILE=basic
+    TEBOOK_DATABASE_PATH=/var/lib/tebook/tebook.db
+"""
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="TEBOOK_", env_file=".env", extra="ignore")
+
+    # Файл бази даних SQLite
+    database_path: str = "tebook.db"
+    # Профіль підключення до БД:
+    #   basic - налаштування SQLite і SQLAlchemy за замовчуванням
+    #   production - WAL, synchronous=NORMAL, mmap, кеш сторінок, busy_timeout
+    db_profile: Literal["basic", "production"] = "production"
+    # Розмір пулу з'єднань і кількість потоків для запитів з async-маршрутів
+    db_pool_size: int = 8
+    # Додаткові з'єднання понад пул при піковому навантаженні
+    db_max_overflow: int = 4
+    # Скільки чекати (мс), поки інше з'єднання звільнить блокування запису
+    db_busy_timeout: int = 5000
+    # Розмір відображення файлу БД у пам'ять (байти)
+    db_mmap_size: int = 256 * 1024 * 1024
+    # Розмір кешу сторінок SQLite на з'єднання (КіБ)
+    db_cache_size: int = 64 * 1024
+    # Вартість bcrypt для нових хешів паролів (хеші з іншою вартістю
+    # перераховуються при наступному вході)
+    bcrypt_rounds: int = 12
+    # Кількість потоків для перевірки паролів
+    login_threads: int = 2
+    # Скільки спроб входу одного користувача може перевірятися одночасно
+    login_concurrency_per_user: int = 2
+    # Створювати тестових користувачів (admin, teacher, student з паролем
+    # 123456) у порожній БД - лише для розробки (python main.py вмикає)
+    create_test_users: bool = False
+    # Таблиці (@7) з більшою кількістю рядків при перегляді на сайті містять
+    # лише першу сторінку, решта підвантажується сторінками такого розміру
+    table_page_rows: int = 100
+    # Токен для /metrics (заголовок "Authorization: Bearer <токен>"). Якщо не
+    # заданий, /metrics відповідає лише на прямі запити з цієї ж машини
+    metrics_token: str = ""
+
+
+settings = Settings()
@@ -0,0 +1,45 @@
+const blocks = document.querySelectorAll('.slide-block');
+let currentBlock = 0;
+
+// Показуємо перший блок одразу
+if (blocks.length > 0) {
+    blocks[0].classList.add('visible');
+}
+
+function showNextBlock() {
+    if (currentBlock < blocks.length - 1) {
+        currentBlock++;
+        blocks[currentBlock].classList.add('visible');
+        // Прокручуємо до нового блоку
+        setTimeout(() => {
+            blocks[currentBlock].scrollIntoView({ behavior: 'smooth', block: 'start' });
+        }, 100);
+    }
+}
+
+// Обробка кліків - тільки на body/document, не на інтерактивних елементах
+document.body.addEventListener('click', (e) => {
+    // Не показуємо наступний блок, якщо клікнули на посилання, кнопку, input, textarea, canvas
+    const tag = e.target.tagName;
+    if (tag === 'A' || tag === 'BUTTON' || tag === 'INPUT' || tag === 'TEXTAREA' || tag === 'SELECT' || tag === 'CANVAS') return;
+    // Перевіряємо, чи клікнули на батьківський елемент з посиланням, кнопкою або canvas
+    if (e.target.closest('a') || e.target.closest('button') || e.target.closest('canvas')) return;
+    showNextBlock();
+});
+
+// Обробка клавіш
+document.addEventListener('keydown', (e) => {
+    if (e.key === 'ArrowRight' || e.key === ' ' || e.key === 'Enter') {
+        e.preventDefault();
+        showNextBlock();
+    }
+});
+
+// Підказка для користувача
+if (blocks.length > 1) {
+    const hint = document.createElement('div');
+    hint.style.cssText = 'position: fixed; bottom: 2rem; right: 2rem; background: rgba(0,0,0,0.7); color: white; padding: 1rem; border-radius: 0.5rem; z-index: 1000; font-size: 0.9rem; pointer-events: none;';
+    hint.textContent = 'Клікніть або натисніть → для наступного слайду';
+    document.body.appendChild(hint);
+    setTimeout(() => hint.remove(), 5000);
+}
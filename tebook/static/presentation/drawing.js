@@ -0,0 +1,110 @@
+// Малювання
+const canvas = document.getElementById('drawingCanvas');
+const ctx = canvas.getContext('2d');
+let isDrawing = false;
+let currentColor = '#000000';
+
+function resizeCanvas() {
+    canvas.width = window.innerWidth;
+    canvas.height = window.innerHeight;
+}
+resizeCanvas();
+window.addEventListener('resize', resizeCanvas);
+
+let isDrawingMode = false;
+let isEraser = false;
+
+const drawingToggleBtn = document.getElementById('drawingToggleBtn');
+const drawingControls = document.getElementById('drawingControls');
+
+drawingToggleBtn.addEventListener('click', function() {
+    if (drawingControls.classList.contains('visible')) {
+        drawingControls.classList.remove('visible');
+        canvas.classList.remove('drawing');
+        isDrawingMode = false;
+    } else {
+        drawingControls.classList.add('visible');
+        canvas.classList.add('drawing');
+        isDrawingMode = true;
+    }
+});
+
+document.getElementById('clearDrawing').addEventListener('click', function() {
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+});
+
+document.querySelectorAll('.color-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));
+        if (document.getElementById('eraserBtn')) {
+            document.getElementById('eraserBtn').classList.remove('active');
+        }
+        this.classList.add('active');
+        currentColor = this.getAttribute('data-color');
+        isEraser = false;
+    });
+});
+
+if (document.getElementById('eraserBtn')) {
+    document.getElementById('eraserBtn').addEventListener('click', function() {
+        document.querySelectorAll('.color-btn').forEach(b => b.classList.remove('active'));
+        this.classList.toggle('active');
+        isEraser = this.classList.contains('active');
+    });
+}
+
+canvas.addEventListener('mousedown', function(e) {
+    if (!isDrawingMode) return;
+    e.stopPropagation();
+    isDrawing = true;
+    ctx.beginPath();
+    ctx.moveTo(e.clientX, e.clientY);
+    if (isEraser) {
+        ctx.globalCompositeOperation = 'destination-out';
+        ctx.lineWidth = 10;
+    } else {
+        ctx.globalCompositeOperation = 'source-over';
+        ctx.strokeStyle = currentColor;
+        ctx.lineWidth = 3;
+    }
+});
+
+canvas.addEventListener('mousemove', function(e) {
+    if (!isDrawing) return;
+    e.stopPropagation();
+    ctx.lineTo(e.clientX, e.clientY);
+    ctx.lineCap = 'round';
+    ctx.stroke();
+});
+
+canvas.addEventListener('mouseup', function() {
+    isDrawing = false;
+});
+
+canvas.addEventListener('mouseleave', function() {
+    isDrawing = false;
+});
+
+// Touch events for mobile
+canvas.addEventListener('touchstart', function(e) {
+    if (!isDrawing) return;
+    e.preventDefault();
+    const touch = e.touches[0];
+    ctx.beginPath();
+    ctx.moveTo(touch.clientX, touch.clientY);
+});
+
+canvas.addEventListener('touchmove', function(e) {
+    if (!isDrawing) return;
+    e.preventDefault();
+    const touch = e.touches[0];
+    ctx.lineTo(touch.clientX, touch.clientY);
+    ctx.strokeStyle = currentColor;
+    ctx.lineWidth = 3;
+    ctx.lineCap = 'round';
+    ctx.stroke();
+});
+
+canvas.addEventListener('touchend', function() {
+    isDrawing = false;
+});
@@ -0,0 +1,69 @@
+let currentSlide = 0;
+const slidesContainer = document.querySelector('.container');
+
+// У режимі відкладеного завантаження сторінка містить лише перші слайди
+// та маніфест; решта підвантажується з сервера за потреби.
+const manifestElement = document.getElementById('slidesManifest');
+const manifest = manifestElement ? JSON.parse(manifestElement.textContent) : null;
+const totalSlides = manifest ? manifest.total : document.querySelectorAll('.slide').length;
+const pendingLoads = {};
+
+function slideElement(n) { return document.getElementById(`slide-${n}`); }
+
+function loadSlides(start) {
+    if (!manifest || start >= totalSlides || slideElement(start)) return Promise.resolve();
+    if (!pendingLoads[start]) {
+        pendingLoads[start] = fetch(`${manifest.url}${start}?count=${manifest.batch}`)
+            .then(response => response.ok ? response.text() : '')
+            .then(html => {
+                const template = document.createElement('template');
+                template.innerHTML = html;
+                template.content.querySelectorAll('.slide').forEach(slide => {
+                    if (!slideElement(slide.id.slice(6))) slidesContainer.appendChild(slide);
+                });
+            })
+            .finally(() => { delete pendingLoads[start]; });
+    }
+    return pendingLoads[start];
+}
+
+function prefetchSlides(n) {
+    if (!manifest) return;
+    for (let i = n + 1; i <= n + manifest.prefetch && i < totalSlides; i++) {
+        if (!slideElement(i)) {
+            loadSlides(i);
+            return;
+        }
+    }
+}
+
+function activateSlide(n) {
+    if (n !== currentSlide || !slideElement(n)) return;
+    document.querySelectorAll('.slide.active').forEach(s => s.classList.remove('active'));
+    slideElement(n).classList.add('active');
+    document.getElementById('counter').textContent = `${currentSlide + 1} / ${totalSlides}`;
+    prefetchSlides(n);
+}
+
+function showSlide(n) {
+    if (totalSlides === 0) return;
+    if (n >= totalSlides) currentSlide = 0;
+    if (n < 0) currentSlide = totalSlides - 1;
+    if (n >= 0 && n < totalSlides) currentSlide = n;
+    const target = currentSlide;
+    if (slideElement(target)) {
+        activateSlide(target);
+    } else {
+        loadSlides(target).then(() => activateSlide(target));
+    }
+}
+
+function nextSlide() { showSlide(currentSlide + 1); }
+function previousSlide() { showSlide(currentSlide - 1); }
+
+document.addEventListener('keydown', (e) => {
+    if (e.key === 'ArrowRight' || e.key === ' ') nextSlide();
+    if (e.key === 'ArrowLeft') previousSlide();
+});
+
+prefetchSlides(0);
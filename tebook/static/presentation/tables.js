@@ -0,0 +1,26 @@
+// Підвантаження наступних сторінок великих таблиць (@7).
+// Адреса будується від адреси презентації: /presentations/<id>/tables/<таблиця>?page=<n>
+const presentationPath = (location.pathname.match(/^\/presentations\/\d+/) || [''])[0];
+
+function loadTablePage(button) {
+    const page = Number(button.dataset.page);
+    const pages = Number(button.dataset.pages);
+    button.disabled = true;
+    fetch(`${presentationPath}/tables/${button.dataset.table}?page=${page}`)
+        .then(response => response.ok ? response.text() : Promise.reject(response.status))
+        .then(html => {
+            const template = document.createElement('template');
+            template.innerHTML = `<table><tbody>${html}</tbody></table>`;
+            const table = button.parentElement.querySelector('table');
+            const body = table.tBodies[table.tBodies.length - 1] || table;
+            template.content.querySelectorAll('tr').forEach(row => body.appendChild(row));
+            button.dataset.page = page + 1;
+            if (page + 1 >= pages) button.remove();
+        })
+        .finally(() => { button.disabled = false; });
+}
+
+document.addEventListener('click', (e) => {
+    const button = e.target.closest('.table-more');
+    if (button) loadTablePage(button);
+});
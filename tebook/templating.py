@@ -0,0 +1,43 @@
+"""
+Спільне середовище шаблонів Jinja2 для всіх маршрутів.
+
+Шаблони компілюються один раз на процес (а не окремо в кожному роутері),
+а скомпільований байт-код зберігається у файловому кеші, тому нові
+процеси (воркери, перезапуски) не компілюють шаблони заново.
+"""
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from .metrics import stage
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Кеш байт-коду у тимчасовому каталозі системи (спільний для всіх процесів);
+# ключ кешу залежить від шляху і вмісту шаблону, тому зміна шаблону
+# не потребує очищення кешу
+environment = Environment(
+    loader=FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    bytecode_cache=FileSystemBytecodeCache(pattern="tebook-%s.cache"),
+    auto_reload=True,
+)
+
+class TimedTemplates(Jinja2Templates):
+    """Jinja2Templates, що враховує рендеринг шаблону як етап "template" метрик запиту"""
+
+    def TemplateResponse(self, *args, **kwargs):
+        with stage("template"):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+templates = TimedTemplates(env=environment)
+
+
+def precompile_templates() -> int:
+    """Компілює всі шаблони заздалегідь (під час запуску). Повертає їх кількість"""
+    names = environment.list_templates(extensions=["html"])
+    for name in names:
+        environment.get_template(name)
+    return len(names)